@@ -8,420 +8,559 @@ This script performs quantitative analysis of sales conversation data:
 - Slide 3: "Discover the Why" is Weakest Skill
 - Slide 4: Question Strategy Differences
 - Slide 5: Performance Variation Across Reps
+
+Usage:
+    python analysis.py              # printed Slide 1-5 numbers plus charts
+    python analysis.py --no-charts  # printed numbers only, skips matplotlib/seaborn
+    python analysis.py --engine duckdb --recording 'recordings/*.parquet' --scoring 'scores/*.parquet'
 """
 
+import argparse
+import os
 import pandas as pd
-import numpy as np
-import json
-import matplotlib.pyplot as plt
-import seaborn as sns
+import validation
 import warnings
+from engines import ENGINES, PandasEngine
+from profiling import span
+from sketches import SKETCHES_FILE, DistributionSketches
 warnings.filterwarnings('ignore')
 
-# Set visualization style
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 6)
+RECORDING_CSV = 'ds_takehome_recording.csv'
+SCORING_CSV = 'ds_takehome_scoring_metadata.csv'
 
-print("=" * 80)
-print("SIRO DS TAKEHOME - MAIN ANALYSIS")
-print("=" * 80)
-print()
 
 # ============================================================================
 # SECTION 1: LOAD AND PREPARE DATA
 # ============================================================================
-print("Loading data...")
-recording_df = pd.read_csv('ds_takehome_recording.csv')
-scoring_df = pd.read_csv('ds_takehome_scoring_metadata.csv')
-
-# Convert timestamps for temporal analysis
-recording_df['dateCreated'] = pd.to_datetime(recording_df['dateCreated'])
-scoring_df['recordingdate'] = pd.to_datetime(scoring_df['recordingdate'])
-
-# Convert durations to minutes for easier interpretation
-recording_df['duration_minutes'] = recording_df['durationInMilliseconds'] / 60000
-recording_df['conversationTime_minutes'] = recording_df['conversationTime'] / 60000
-
-# Calculate speaking ratio (rep speaking time / total conversation time)
-recording_df['speaking_ratio'] = recording_df['repSpeakingTime'] / recording_df['conversationTime']
-
-# Calculate questions ratio (rep questions / total questions)
-recording_df['questions_ratio'] = recording_df['repQuestionsCount'] / (
-    recording_df['repQuestionsCount'] + recording_df['customerQuestionsCount'] + 1
-)
+def read_inputs(recording_path=RECORDING_CSV, scoring_path=SCORING_CSV, validate=True, quality_dir=None):
+    """Read both CSVs and, with validate (the default), quarantine bad rows
+
+    quality_dir, if given, receives quarantine.csv and data_quality.json;
+    nothing is written otherwise. Shared by both engines so they see the same rows.
+    """
+    recording_df = pd.read_csv(recording_path)
+    scoring_df = pd.read_csv(scoring_path)
+    if validate:
+        recording_df, scoring_df, quarantine_df, metrics = validation.validate(recording_df, scoring_df)
+        print(validation.describe(metrics))
+        if quality_dir is not None:
+            validation.write_report(quarantine_df, metrics, quality_dir)
+    return recording_df, scoring_df
+
+
+def load_data(recording_path=RECORDING_CSV, scoring_path=SCORING_CSV, validate=True, quality_dir=None,
+              sketches=None):
+    """Load recordings and skill evaluations, derive metrics and merge on recordingid
+
+    With validate (the default) bad rows are quarantined before anything is
+    derived (see read_inputs). sketches, a DistributionSketches, is updated
+    with the loaded rows (and saved to quality_dir as sketches.json).
+    """
+    with span('load') as s:
+        print("Loading data...")
+        recording_df, scoring_df = read_inputs(recording_path, scoring_path, validate, quality_dir)
+
+        if sketches is not None:
+            sketches.update_scores(scoring_df)
+            sketches.update_recordings(recording_df)
+            if quality_dir is not None:
+                sketches.save(os.path.join(quality_dir, SKETCHES_FILE))
+
+        # Convert timestamps for temporal analysis
+        recording_df['dateCreated'] = pd.to_datetime(recording_df['dateCreated'])
+        scoring_df['recordingdate'] = pd.to_datetime(scoring_df['recordingdate'])
+
+        # Convert durations to minutes for easier interpretation
+        recording_df['duration_minutes'] = recording_df['durationInMilliseconds'] / 60000
+        recording_df['conversationTime_minutes'] = recording_df['conversationTime'] / 60000
+
+        # Calculate speaking ratio (rep speaking time / total conversation time); undefined for zero conversation time
+        recording_df['speaking_ratio'] = recording_df['repSpeakingTime'] / recording_df['conversationTime'].where(
+            recording_df['conversationTime'] > 0
+        )
+
+        # Calculate questions ratio (rep questions / total questions)
+        recording_df['questions_ratio'] = recording_df['repQuestionsCount'] / (
+            recording_df['repQuestionsCount'] + recording_df['customerQuestionsCount'] + 1
+        )
+
+        # Ensure score is numeric
+        scoring_df['score'] = pd.to_numeric(scoring_df['score'], errors='coerce')
+
+        # Merge recording and scoring data
+        merged_df = recording_df.merge(
+            scoring_df,
+            on='recordingid',
+            how='inner',
+            suffixes=('_recording', '_scoring')
+        )
+
+        print(f"Loaded {len(recording_df)} recordings and {len(scoring_df)} skill evaluations")
+        print(f"Merged dataset: {len(merged_df)} records")
+        print()
+        s.add_rows(len(recording_df) + len(scoring_df))
+    return recording_df, scoring_df, merged_df
 
-# Ensure score is numeric
-scoring_df['score'] = pd.to_numeric(scoring_df['score'], errors='coerce')
-
-# Merge recording and scoring data
-merged_df = recording_df.merge(
-    scoring_df,
-    on='recordingid',
-    how='inner',
-    suffixes=('_recording', '_scoring')
-)
-
-print(f"Loaded {len(recording_df)} recordings and {len(scoring_df)} skill evaluations")
-print(f"Merged dataset: {len(merged_df)} records")
-print()
 
 # ============================================================================
 # SECTION 2: SLIDE 1 - EXECUTIVE SUMMARY
 # ============================================================================
-print("=" * 80)
-print("SLIDE 1: EXECUTIVE SUMMARY")
-print("=" * 80)
-
-# Basic statistics
-total_recordings = len(recording_df)
-total_users = recording_df['userId'].nunique()
-total_evaluations = len(scoring_df)
-unique_skills = scoring_df['skillName'].nunique()
-overall_win_rate = (recording_df['outcome'] == 'won').sum() / len(recording_df) * 100
-avg_duration = recording_df['duration_minutes'].mean()
-avg_skill_score = scoring_df['score'].mean()
-date_range = f"{recording_df['dateCreated'].min().date()} to {recording_df['dateCreated'].max().date()}"
-
-print(f"Total Recordings: {total_recordings}")
-print(f"Total Users: {total_users}")
-print(f"Total Skill Evaluations: {total_evaluations}")
-print(f"Unique Skills: {unique_skills}")
-print(f"Overall Win Rate: {overall_win_rate:.2f}%")
-print(f"Average Call Duration: {avg_duration:.2f} minutes")
-print(f"Average Skill Score: {avg_skill_score:.2f}/5.0")
-print(f"Date Range: {date_range}")
-
-# Temporal analysis - comparing first week vs last week
-recording_df['date'] = recording_df['dateCreated'].dt.date
-early_period = recording_df[recording_df['date'] <= pd.to_datetime('2025-08-15').date()]
-late_period = recording_df[recording_df['date'] >= pd.to_datetime('2025-09-15').date()]
-
-first_week_win_rate = (early_period['outcome'] == 'won').sum() / len(early_period) * 100
-last_week_win_rate = (late_period['outcome'] == 'won').sum() / len(late_period) * 100
-
-# Calculate weekly win rates for the full period
-recording_df['week'] = recording_df['dateCreated'].dt.to_period('W')
-weekly_win_rates = recording_df.groupby('week').apply(
-    lambda x: (x['outcome'] == 'won').sum() / len(x) * 100
-).reset_index()
-weekly_win_rates.columns = ['week', 'win_rate']
-weekly_win_rates['week_str'] = weekly_win_rates['week'].astype(str)
-print("\nWeekly Win Rates:")
-for _, row in weekly_win_rates.iterrows():
-    print(f"  {row['week_str']}: {row['win_rate']:.2f}%")
-
-# Skill scores over time
-early_scores = merged_df[merged_df['recordingdate'].dt.date <= pd.to_datetime('2025-08-15').date()]['score'].mean()
-late_scores = merged_df[merged_df['recordingdate'].dt.date >= pd.to_datetime('2025-09-15').date()]['score'].mean()
-
-print(f"\nFirst Week Win Rate: {first_week_win_rate:.2f}%")
-print(f"Last Week Win Rate: {last_week_win_rate:.2f}%")
-print(f"Win Rate Decline: {first_week_win_rate - last_week_win_rate:.2f} percentage points")
-print(f"First Week Skill Score: {early_scores:.2f}")
-print(f"Last Week Skill Score: {late_scores:.2f}")
-print(f"Skill Score Decline: {early_scores - late_scores:.2f} points ({((early_scores - late_scores) / early_scores * 100):.1f}%)")
+def slide1_executive_summary(engine):
+    """Dataset overview and early vs late period comparison
+
+    Returns the headline numbers as a dict, used for the cross-tenant summary
+    """
+    with span('slide1_executive_summary') as s:
+        print("=" * 80)
+        print("SLIDE 1: EXECUTIVE SUMMARY")
+        print("=" * 80)
+
+        # Basic statistics
+        headline = engine.headline()
+        overall_win_rate = headline['overall_win_rate']
+        date_range = f"{headline['first_date']} to {headline['last_date']}"
+
+        print(f"Total Recordings: {headline['total_recordings']}")
+        print(f"Total Users: {headline['total_users']}")
+        print(f"Total Skill Evaluations: {headline['total_evaluations']}")
+        print(f"Unique Skills: {headline['unique_skills']}")
+        print(f"Overall Win Rate: {overall_win_rate:.2f}%")
+        print(f"Average Call Duration: {headline['avg_duration']:.2f} minutes")
+        print(f"Average Skill Score: {headline['avg_skill_score']:.2f}/5.0")
+        print(f"Date Range: {date_range}")
+
+        # Temporal analysis - comparing first week vs last week
+        first_week_win_rate = headline['first_week_win_rate']
+        last_week_win_rate = headline['last_week_win_rate']
+
+        # Calculate weekly win rates for the full period
+        weekly_win_rates = engine.weekly_win_rates()
+        print("\nWeekly Win Rates:")
+        for _, row in weekly_win_rates.iterrows():
+            print(f"  {row['week_str']}: {row['win_rate']:.2f}%")
+
+        # Skill scores over time
+        early_scores = headline['early_scores']
+        late_scores = headline['late_scores']
+
+        print(f"\nFirst Week Win Rate: {first_week_win_rate:.2f}%")
+        print(f"Last Week Win Rate: {last_week_win_rate:.2f}%")
+        print(f"Win Rate Decline: {first_week_win_rate - last_week_win_rate:.2f} percentage points")
+        print(f"First Week Skill Score: {early_scores:.2f}")
+        print(f"Last Week Skill Score: {late_scores:.2f}")
+        print(f"Skill Score Decline: {early_scores - late_scores:.2f} points ({((early_scores - late_scores) / early_scores * 100):.1f}%)")
+        s.add_rows(headline['total_recordings'] + headline['total_evaluations'])
+    return {
+        'total_recordings': headline['total_recordings'],
+        'total_users': headline['total_users'],
+        'total_evaluations': headline['total_evaluations'],
+        'overall_win_rate': overall_win_rate,
+        'avg_duration_min': headline['avg_duration'],
+        'avg_skill_score': headline['avg_skill_score'],
+        'first_week_win_rate': first_week_win_rate,
+        'last_week_win_rate': last_week_win_rate,
+        'first_week_skill_score': early_scores,
+        'last_week_skill_score': late_scores,
+    }
+
 
 # ============================================================================
 # SECTION 3: SLIDE 2 - SKILL SCORES PREDICT OUTCOMES
 # ============================================================================
-print("\n" + "=" * 80)
-print("SLIDE 2: SKILL SCORES PREDICT OUTCOMES")
-print("=" * 80)
-
-# Calculate average skill scores by outcome
-skill_outcome_scores = merged_df.groupby(['skillName', 'outcome'])['score'].mean().unstack(fill_value=0)
-print("\nSkill Scores by Outcome:")
-print(skill_outcome_scores.round(2))
-
-# Calculate percentage improvements
-for skill in skill_outcome_scores.index:
-    won_score = skill_outcome_scores.loc[skill, 'won']
-    lost_score = skill_outcome_scores.loc[skill, 'lost']
-    if lost_score > 0:
-        improvement = ((won_score - lost_score) / lost_score) * 100
-        print(f"{skill}: Won={won_score:.2f}, Lost={lost_score:.2f}, Improvement={improvement:.0f}%")
+def slide2_skill_scores(engine):
+    """Average skill scores for won vs lost deals"""
+    with span('slide2_skill_scores') as s:
+        print("\n" + "=" * 80)
+        print("SLIDE 2: SKILL SCORES PREDICT OUTCOMES")
+        print("=" * 80)
+
+        # Calculate average skill scores by outcome
+        skill_outcome_scores = engine.skill_outcome_scores().fillna(0)
+        print("\nSkill Scores by Outcome:")
+        print(skill_outcome_scores.round(2))
+
+        # Calculate percentage improvements
+        for skill in skill_outcome_scores.index:
+            won_score = skill_outcome_scores.loc[skill, 'won']
+            lost_score = skill_outcome_scores.loc[skill, 'lost']
+            if lost_score > 0:
+                improvement = ((won_score - lost_score) / lost_score) * 100
+                print(f"{skill}: Won={won_score:.2f}, Lost={lost_score:.2f}, Improvement={improvement:.0f}%")
+        counts = engine.row_counts()
+        s.add_rows(counts['merged'])
+    return skill_outcome_scores
+
 
 # ============================================================================
 # SECTION 4: SLIDE 3 - "DISCOVER THE WHY" IS WEAKEST SKILL
 # ============================================================================
-print("\n" + "=" * 80)
-print("SLIDE 3: 'DISCOVER THE WHY' IS WEAKEST SKILL")
-print("=" * 80)
-
-# Calculate average scores by skill
-skill_stats = scoring_df.groupby('skillName')['score'].agg(['mean', 'std', 'count', 'min', 'max'])
-skill_stats = skill_stats.sort_values('mean', ascending=False)
-
-print("\nAverage Skill Scores (sorted):")
-print(skill_stats.round(2))
-
-# Focus on "Discover the Why"
-discover_why = scoring_df[scoring_df['skillName'] == 'Discover the "Why"']
-discover_why_stats = {
-    'mean': discover_why['score'].mean(),
-    'std': discover_why['score'].std(),
-    'won_mean': merged_df[(merged_df['skillName'] == 'Discover the "Why"') & (merged_df['outcome'] == 'won')]['score'].mean(),
-    'lost_mean': merged_df[(merged_df['skillName'] == 'Discover the "Why"') & (merged_df['outcome'] == 'lost')]['score'].mean(),
-    'score_1_count': (discover_why['score'] == 1).sum(),
-    'score_5_count': (discover_why['score'] == 5).sum(),
-    'total': len(discover_why)
-}
-
-print(f"\n'Discover the Why' Statistics:")
-print(f"  Average Score: {discover_why_stats['mean']:.2f}/5.0")
-print(f"  Standard Deviation: {discover_why_stats['std']:.2f}")
-print(f"  Won Deals Average: {discover_why_stats['won_mean']:.2f}/5.0")
-print(f"  Lost Deals Average: {discover_why_stats['lost_mean']:.2f}/5.0")
-print(f"  Score 1 Frequency: {discover_why_stats['score_1_count']} ({discover_why_stats['score_1_count']/discover_why_stats['total']*100:.1f}%)")
-print(f"  Score 5 Frequency: {discover_why_stats['score_5_count']} ({discover_why_stats['score_5_count']/discover_why_stats['total']*100:.1f}%)")
+def slide3_discover_why(engine):
+    """Per-skill score statistics, focusing on the weakest skill (Discover the "Why")"""
+    with span('slide3_discover_why') as s:
+        print("\n" + "=" * 80)
+        print("SLIDE 3: 'DISCOVER THE WHY' IS WEAKEST SKILL")
+        print("=" * 80)
+
+        # Calculate average scores by skill
+        skill_stats = engine.skill_stats()
+
+        print("\nAverage Skill Scores (sorted):")
+        print(skill_stats.round(2))
+
+        # Focus on "Discover the Why"
+        discover_why_stats = engine.skill_focus_stats('Discover the "Why"')
+
+        print(f"\n'Discover the Why' Statistics:")
+        print(f"  Average Score: {discover_why_stats['mean']:.2f}/5.0")
+        print(f"  Standard Deviation: {discover_why_stats['std']:.2f}")
+        print(f"  Won Deals Average: {discover_why_stats['won_mean']:.2f}/5.0")
+        print(f"  Lost Deals Average: {discover_why_stats['lost_mean']:.2f}/5.0")
+        print(f"  Score 1 Frequency: {discover_why_stats['score_1_count']} ({discover_why_stats['score_1_count']/discover_why_stats['total']*100:.1f}%)")
+        print(f"  Score 5 Frequency: {discover_why_stats['score_5_count']} ({discover_why_stats['score_5_count']/discover_why_stats['total']*100:.1f}%)")
+        counts = engine.row_counts()
+        s.add_rows(counts['evaluations'] + counts['merged'])
+    return skill_stats, discover_why_stats
+
 
 # ============================================================================
 # SECTION 5: SLIDE 4 - QUESTION STRATEGY DIFFERENCES
 # ============================================================================
-print("\n" + "=" * 80)
-print("SLIDE 4: QUESTION STRATEGY DIFFERENCES")
-print("=" * 80)
-
-# Calculate average questions by outcome
-outcome_questions = recording_df.groupby('outcome').agg({
-    'repQuestionsCount': 'mean',
-    'customerQuestionsCount': 'mean'
-})
-
-print("\nAverage Questions by Outcome:")
-print(outcome_questions.round(2))
-
-# Calculate ratios
-won_rep_questions = outcome_questions.loc['won', 'repQuestionsCount']
-won_customer_questions = outcome_questions.loc['won', 'customerQuestionsCount']
-won_ratio = won_rep_questions / won_customer_questions
-
-lost_rep_questions = outcome_questions.loc['lost', 'repQuestionsCount']
-lost_customer_questions = outcome_questions.loc['lost', 'customerQuestionsCount']
-lost_ratio = lost_rep_questions / lost_customer_questions
-
-print(f"\nWon Deals:")
-print(f"  Rep Questions: {won_rep_questions:.2f}")
-print(f"  Customer Questions: {won_customer_questions:.2f}")
-print(f"  Ratio: {won_ratio:.2f} rep questions per customer question")
-
-print(f"\nLost Deals:")
-print(f"  Rep Questions: {lost_rep_questions:.2f}")
-print(f"  Customer Questions: {lost_customer_questions:.2f}")
-print(f"  Ratio: {lost_ratio:.2f} rep questions per customer question")
-
-print(f"\nDifference:")
-print(f"  Rep asks {won_rep_questions - lost_rep_questions:.2f} more questions in won deals")
-print(f"  Customer asks {lost_customer_questions - won_customer_questions:.2f} more questions in lost deals")
+def slide4_question_strategy(engine):
+    """Rep and customer question counts by outcome"""
+    with span('slide4_question_strategy') as s:
+        print("\n" + "=" * 80)
+        print("SLIDE 4: QUESTION STRATEGY DIFFERENCES")
+        print("=" * 80)
+
+        # Calculate average questions by outcome
+        outcome_questions = engine.outcome_questions()
+
+        print("\nAverage Questions by Outcome:")
+        print(outcome_questions.round(2))
+
+        # Calculate ratios
+        won_rep_questions = outcome_questions.loc['won', 'repQuestionsCount']
+        won_customer_questions = outcome_questions.loc['won', 'customerQuestionsCount']
+        won_ratio = won_rep_questions / won_customer_questions
+
+        lost_rep_questions = outcome_questions.loc['lost', 'repQuestionsCount']
+        lost_customer_questions = outcome_questions.loc['lost', 'customerQuestionsCount']
+        lost_ratio = lost_rep_questions / lost_customer_questions
+
+        print(f"\nWon Deals:")
+        print(f"  Rep Questions: {won_rep_questions:.2f}")
+        print(f"  Customer Questions: {won_customer_questions:.2f}")
+        print(f"  Ratio: {won_ratio:.2f} rep questions per customer question")
+
+        print(f"\nLost Deals:")
+        print(f"  Rep Questions: {lost_rep_questions:.2f}")
+        print(f"  Customer Questions: {lost_customer_questions:.2f}")
+        print(f"  Ratio: {lost_ratio:.2f} rep questions per customer question")
+
+        print(f"\nDifference:")
+        print(f"  Rep asks {won_rep_questions - lost_rep_questions:.2f} more questions in won deals")
+        print(f"  Customer asks {lost_customer_questions - won_customer_questions:.2f} more questions in lost deals")
+        counts = engine.row_counts()
+        s.add_rows(counts['recordings'])
+    return outcome_questions
+
 
 # ============================================================================
 # SECTION 6: SLIDE 5 - PERFORMANCE VARIATION ACROSS REPS
 # ============================================================================
-print("\n" + "=" * 80)
-print("SLIDE 5: PERFORMANCE VARIATION ACROSS REPS")
-print("=" * 80)
-
-# Calculate user-level statistics
-user_stats = recording_df.groupby('userId').agg({
-    'recordingid': 'count',
-    'outcome': lambda x: (x == 'won').sum(),
-    'duration_minutes': 'mean',
-    'repWordCount': 'mean',
-    'repQuestionsCount': 'mean',
-    'customerQuestionsCount': 'mean'
-}).round(2)
-
-user_stats.columns = ['num_recordings', 'wins', 'avg_duration_min', 'avg_words', 'avg_rep_questions', 'avg_customer_questions']
-user_stats['win_rate'] = (user_stats['wins'] / user_stats['num_recordings'] * 100).round(2)
-
-# Calculate average skill scores per user
-user_skill_scores = merged_df.groupby('userId_recording')['score'].mean()
-user_stats['avg_skill_score'] = user_skill_scores.round(2)
-
-# Sort by win rate
-user_stats = user_stats.sort_values('win_rate', ascending=False)
-
-print("\nUser Performance Summary:")
-print(user_stats[['num_recordings', 'win_rate', 'avg_skill_score']])
-
-# Calculate range
-highest_win_rate = user_stats['win_rate'].max()
-lowest_win_rate = user_stats['win_rate'].min()
-difference_ratio = highest_win_rate / lowest_win_rate
-
-print(f"\nWin Rate Range:")
-print(f"  Highest: {highest_win_rate:.1f}%")
-print(f"  Lowest: {lowest_win_rate:.1f}%")
-print(f"  Difference: {difference_ratio:.1f}x")
+def slide5_rep_variation(engine):
+    """Per-rep win rates, activity and average skill scores"""
+    with span('slide5_rep_variation') as s:
+        print("\n" + "=" * 80)
+        print("SLIDE 5: PERFORMANCE VARIATION ACROSS REPS")
+        print("=" * 80)
+
+        # Calculate user-level statistics, sorted by win rate
+        user_stats = engine.user_stats()
+
+        print("\nUser Performance Summary:")
+        print(user_stats[['num_recordings', 'win_rate', 'avg_skill_score']])
+
+        # Calculate range
+        highest_win_rate = user_stats['win_rate'].max()
+        lowest_win_rate = user_stats['win_rate'].min()
+        difference_ratio = highest_win_rate / lowest_win_rate
+
+        print(f"\nWin Rate Range:")
+        print(f"  Highest: {highest_win_rate:.1f}%")
+        print(f"  Lowest: {lowest_win_rate:.1f}%")
+        print(f"  Difference: {difference_ratio:.1f}x")
+        counts = engine.row_counts()
+        s.add_rows(counts['recordings'] + counts['merged'])
+    return user_stats
+
 
 # ============================================================================
 # SECTION 7: CREATE VISUALIZATIONS
 # ============================================================================
-print("\n" + "=" * 80)
-print("GENERATING VISUALIZATIONS")
-print("=" * 80)
-
-# Create figure with subplots for key charts
-fig = plt.figure(figsize=(20, 12))
-
-# Chart 1: Outcome Distribution (Slide 1)
-ax1 = plt.subplot(2, 3, 1)
-outcome_counts = recording_df['outcome'].value_counts()
-ax1.bar(outcome_counts.index, outcome_counts.values, color=['#2ecc71', '#e74c3c', '#95a5a6'])
-ax1.set_title('Outcome Distribution', fontsize=14, fontweight='bold')
-ax1.set_ylabel('Count')
-ax1.set_xlabel('Outcome')
-for i, v in enumerate(outcome_counts.values):
-    ax1.text(i, v, str(v), ha='center', va='bottom')
-
-# Chart 2: Skill Scores by Outcome (Slide 2)
-ax2 = plt.subplot(2, 3, 2)
-skill_outcome_plot = merged_df.groupby(['skillName', 'outcome'])['score'].mean().unstack()
-skill_outcome_plot.plot(kind='barh', ax=ax2, color=['#2ecc71', '#e74c3c', '#95a5a6'])
-ax2.set_title('Skill Scores by Outcome', fontsize=14, fontweight='bold')
-ax2.set_xlabel('Average Score')
-ax2.legend(title='Outcome')
-ax2.invert_yaxis()
-
-# Chart 3: Average Questions by Outcome (Slide 4)
-ax3 = plt.subplot(2, 3, 3)
-outcome_questions_plot = recording_df.groupby('outcome')[['repQuestionsCount', 'customerQuestionsCount']].mean()
-outcome_questions_plot.plot(kind='bar', ax=ax3, color=['#3498db', '#9b59b6'])
-ax3.set_title('Average Questions by Outcome', fontsize=14, fontweight='bold')
-ax3.set_ylabel('Average Count')
-ax3.set_xlabel('Outcome')
-ax3.legend(['Rep Questions', 'Customer Questions'])
-ax3.tick_params(axis='x', rotation=0)
-
-# Chart 4: Average Skill Scores (Slide 3)
-ax4 = plt.subplot(2, 3, 4)
-skill_scores = scoring_df.groupby('skillName')['score'].mean().sort_values(ascending=False)
-ax4.barh(range(len(skill_scores)), skill_scores.values, color='#3498db')
-ax4.set_yticks(range(len(skill_scores)))
-ax4.set_yticklabels(skill_scores.index)
-ax4.set_title('Average Skill Scores', fontsize=14, fontweight='bold')
-ax4.set_xlabel('Average Score')
-ax4.invert_yaxis()
-for i, v in enumerate(skill_scores.values):
-    ax4.text(v + 0.05, i, f'{v:.2f}', va='center', fontsize=9)
-
-# Chart 5: User Win Rates (Slide 5)
-ax5 = plt.subplot(2, 3, 5)
-user_win_rates = user_stats.sort_values('win_rate', ascending=False)
-ax5.barh(range(len(user_win_rates)), user_win_rates['win_rate'].values, color='#2ecc71')
-ax5.set_yticks(range(len(user_win_rates)))
-ax5.set_yticklabels([uid[:15] + '...' for uid in user_win_rates.index], fontsize=9)
-ax5.set_title('User Win Rates', fontsize=14, fontweight='bold')
-ax5.set_xlabel('Win Rate (%)')
-ax5.invert_yaxis()
-for i, v in enumerate(user_win_rates['win_rate'].values):
-    ax5.text(v + 1, i, f'{v:.1f}%', va='center', fontsize=9, fontweight='bold')
-
-# Chart 6: Win Rate Over Time (Slide 1 & 6)
-ax6 = plt.subplot(2, 3, 6)
-daily_outcomes = recording_df.groupby('date')['outcome'].apply(lambda x: (x == 'won').sum() / len(x) * 100)
-daily_outcomes.sort_index().plot(kind='line', ax=ax6, marker='o', color='#e67e22', linewidth=2, markersize=6)
-ax6.set_title('Win Rate Over Time', fontsize=14, fontweight='bold')
-ax6.set_xlabel('Date')
-ax6.set_ylabel('Win Rate (%)')
-ax6.grid(True, alpha=0.3)
-ax6.axhline(y=overall_win_rate, color='red', linestyle='--', alpha=0.5, label=f'Overall Avg ({overall_win_rate:.0f}%)')
-ax6.legend(fontsize=9)
-ax6.tick_params(axis='x', rotation=45)
-
-plt.tight_layout()
-plt.savefig('analysis_visualizations.png', dpi=300, bbox_inches='tight')
-print("\nVisualizations saved to 'analysis_visualizations.png'")
-
-# Save individual charts
-print("\nSaving individual charts...")
-
-# Chart 1
-fig, ax = plt.subplots(figsize=(8, 6))
-outcome_counts = recording_df['outcome'].value_counts()
-ax.bar(outcome_counts.index, outcome_counts.values, color=['#2ecc71', '#e74c3c', '#95a5a6'])
-ax.set_title('Outcome Distribution', fontsize=16, fontweight='bold', pad=20)
-ax.set_ylabel('Count', fontsize=12)
-ax.set_xlabel('Outcome', fontsize=12)
-for i, v in enumerate(outcome_counts.values):
-    ax.text(i, v, str(v), ha='center', va='bottom', fontsize=12, fontweight='bold')
-plt.tight_layout()
-plt.savefig('chart_01_outcome_distribution.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# Chart 2
-fig, ax = plt.subplots(figsize=(10, 7))
-skill_outcome_plot = merged_df.groupby(['skillName', 'outcome'])['score'].mean().unstack()
-skill_outcome_plot.plot(kind='barh', ax=ax, color=['#2ecc71', '#e74c3c', '#95a5a6'])
-ax.set_title('Skill Scores by Outcome', fontsize=16, fontweight='bold', pad=20)
-ax.set_xlabel('Average Score', fontsize=12)
-ax.set_ylabel('Skill Name', fontsize=12)
-ax.legend(title='Outcome', fontsize=10)
-ax.invert_yaxis()
-plt.tight_layout()
-plt.savefig('chart_02_skill_scores_by_outcome.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# Chart 3
-fig, ax = plt.subplots(figsize=(8, 6))
-outcome_questions_plot = recording_df.groupby('outcome')[['repQuestionsCount', 'customerQuestionsCount']].mean()
-outcome_questions_plot.plot(kind='bar', ax=ax, color=['#3498db', '#9b59b6'])
-ax.set_title('Average Questions by Outcome', fontsize=16, fontweight='bold', pad=20)
-ax.set_ylabel('Average Count', fontsize=12)
-ax.set_xlabel('Outcome', fontsize=12)
-ax.legend(['Rep Questions', 'Customer Questions'], fontsize=10)
-ax.tick_params(axis='x', rotation=0)
-plt.tight_layout()
-plt.savefig('chart_03_questions_by_outcome.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# Chart 4
-fig, ax = plt.subplots(figsize=(10, 7))
-skill_scores = scoring_df.groupby('skillName')['score'].mean().sort_values(ascending=False)
-ax.barh(range(len(skill_scores)), skill_scores.values, color='#3498db')
-ax.set_yticks(range(len(skill_scores)))
-ax.set_yticklabels(skill_scores.index)
-ax.set_title('Average Skill Scores', fontsize=16, fontweight='bold', pad=20)
-ax.set_xlabel('Average Score', fontsize=12)
-ax.invert_yaxis()
-for i, v in enumerate(skill_scores.values):
-    ax.text(v + 0.05, i, f'{v:.2f}', va='center', fontsize=10)
-plt.tight_layout()
-plt.savefig('chart_04_average_skill_scores.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# Chart 5
-fig, ax = plt.subplots(figsize=(10, 6))
-user_win_rates = user_stats.sort_values('win_rate', ascending=False)
-ax.barh(range(len(user_win_rates)), user_win_rates['win_rate'].values, color='#2ecc71')
-ax.set_yticks(range(len(user_win_rates)))
-ax.set_yticklabels([uid[:15] + '...' for uid in user_win_rates.index], fontsize=9)
-ax.set_title('User Win Rates', fontsize=16, fontweight='bold', pad=20)
-ax.set_xlabel('Win Rate (%)', fontsize=12)
-ax.invert_yaxis()
-for i, v in enumerate(user_win_rates['win_rate'].values):
-    ax.text(v + 1, i, f'{v:.1f}%', va='center', fontsize=10, fontweight='bold')
-plt.tight_layout()
-plt.savefig('chart_05_user_win_rates.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# Chart 6
-fig, ax = plt.subplots(figsize=(12, 6))
-daily_outcomes = recording_df.groupby('date')['outcome'].apply(lambda x: (x == 'won').sum() / len(x) * 100)
-daily_outcomes.sort_index().plot(kind='line', ax=ax, marker='o', color='#e67e22', linewidth=2, markersize=6)
-ax.set_title('Win Rate Over Time', fontsize=16, fontweight='bold', pad=20)
-ax.set_xlabel('Date', fontsize=12)
-ax.set_ylabel('Win Rate (%)', fontsize=12)
-ax.grid(True, alpha=0.3)
-ax.axhline(y=overall_win_rate, color='red', linestyle='--', alpha=0.5, label=f'Overall Average ({overall_win_rate:.0f}%)')
-ax.legend(fontsize=10)
-ax.tick_params(axis='x', rotation=45)
-plt.tight_layout()
-plt.savefig('chart_06_win_rate_over_time.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-print("All individual charts saved successfully!")
-
-print("\n" + "=" * 80)
-print("ANALYSIS COMPLETE")
-print("=" * 80)
+def create_visualizations(engine, user_stats, overall_win_rate, output_dir='.'):
+    """Save the dashboard figure and the individual slide charts into output_dir"""
+    # Imported here so stats-only runs never pay for the plotting stack
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Set visualization style
+    sns.set_style("whitegrid")
+    plt.rcParams['figure.figsize'] = (12, 6)
+
+    # Aggregates shared by the dashboard and the individual charts
+    with span('charts_aggregates'):
+        outcome_counts = engine.outcome_counts()
+        skill_outcome_plot = engine.skill_outcome_scores()
+        outcome_questions_plot = engine.outcome_questions()[['repQuestionsCount', 'customerQuestionsCount']]
+        skill_scores = engine.skill_stats()['mean']
+        daily_outcomes = engine.daily_win_rates()
+
+    with span('charts_dashboard'):
+        print("\n" + "=" * 80)
+        print("GENERATING VISUALIZATIONS")
+        print("=" * 80)
+
+        # Create figure with subplots for key charts
+        fig = plt.figure(figsize=(20, 12))
+
+        # Chart 1: Outcome Distribution (Slide 1)
+        ax1 = plt.subplot(2, 3, 1)
+        ax1.bar(outcome_counts.index, outcome_counts.values, color=['#2ecc71', '#e74c3c', '#95a5a6'])
+        ax1.set_title('Outcome Distribution', fontsize=14, fontweight='bold')
+        ax1.set_ylabel('Count')
+        ax1.set_xlabel('Outcome')
+        for i, v in enumerate(outcome_counts.values):
+            ax1.text(i, v, str(v), ha='center', va='bottom')
+
+        # Chart 2: Skill Scores by Outcome (Slide 2)
+        ax2 = plt.subplot(2, 3, 2)
+        skill_outcome_plot.plot(kind='barh', ax=ax2, color=['#2ecc71', '#e74c3c', '#95a5a6'])
+        ax2.set_title('Skill Scores by Outcome', fontsize=14, fontweight='bold')
+        ax2.set_xlabel('Average Score')
+        ax2.legend(title='Outcome')
+        ax2.invert_yaxis()
+
+        # Chart 3: Average Questions by Outcome (Slide 4)
+        ax3 = plt.subplot(2, 3, 3)
+        outcome_questions_plot.plot(kind='bar', ax=ax3, color=['#3498db', '#9b59b6'])
+        ax3.set_title('Average Questions by Outcome', fontsize=14, fontweight='bold')
+        ax3.set_ylabel('Average Count')
+        ax3.set_xlabel('Outcome')
+        ax3.legend(['Rep Questions', 'Customer Questions'])
+        ax3.tick_params(axis='x', rotation=0)
+
+        # Chart 4: Average Skill Scores (Slide 3)
+        ax4 = plt.subplot(2, 3, 4)
+        ax4.barh(range(len(skill_scores)), skill_scores.values, color='#3498db')
+        ax4.set_yticks(range(len(skill_scores)))
+        ax4.set_yticklabels(skill_scores.index)
+        ax4.set_title('Average Skill Scores', fontsize=14, fontweight='bold')
+        ax4.set_xlabel('Average Score')
+        ax4.invert_yaxis()
+        for i, v in enumerate(skill_scores.values):
+            ax4.text(v + 0.05, i, f'{v:.2f}', va='center', fontsize=9)
+
+        # Chart 5: User Win Rates (Slide 5)
+        ax5 = plt.subplot(2, 3, 5)
+        user_win_rates = user_stats.sort_values('win_rate', ascending=False)
+        ax5.barh(range(len(user_win_rates)), user_win_rates['win_rate'].values, color='#2ecc71')
+        ax5.set_yticks(range(len(user_win_rates)))
+        ax5.set_yticklabels([uid[:15] + '...' for uid in user_win_rates.index], fontsize=9)
+        ax5.set_title('User Win Rates', fontsize=14, fontweight='bold')
+        ax5.set_xlabel('Win Rate (%)')
+        ax5.invert_yaxis()
+        for i, v in enumerate(user_win_rates['win_rate'].values):
+            ax5.text(v + 1, i, f'{v:.1f}%', va='center', fontsize=9, fontweight='bold')
+
+        # Chart 6: Win Rate Over Time (Slide 1 & 6)
+        ax6 = plt.subplot(2, 3, 6)
+        daily_outcomes.sort_index().plot(kind='line', ax=ax6, marker='o', color='#e67e22', linewidth=2, markersize=6)
+        ax6.set_title('Win Rate Over Time', fontsize=14, fontweight='bold')
+        ax6.set_xlabel('Date')
+        ax6.set_ylabel('Win Rate (%)')
+        ax6.grid(True, alpha=0.3)
+        ax6.axhline(y=overall_win_rate, color='red', linestyle='--', alpha=0.5, label=f'Overall Avg ({overall_win_rate:.0f}%)')
+        ax6.legend(fontsize=9)
+        ax6.tick_params(axis='x', rotation=45)
+
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, 'analysis_visualizations.png'), dpi=300, bbox_inches='tight')
+        plt.close(fig)
+        print("\nVisualizations saved to 'analysis_visualizations.png'")
+
+    with span('charts_individual'):
+        # Save individual charts
+        print("\nSaving individual charts...")
+
+        # Chart 1
+        fig, ax = plt.subplots(figsize=(8, 6))
+        ax.bar(outcome_counts.index, outcome_counts.values, color=['#2ecc71', '#e74c3c', '#95a5a6'])
+        ax.set_title('Outcome Distribution', fontsize=16, fontweight='bold', pad=20)
+        ax.set_ylabel('Count', fontsize=12)
+        ax.set_xlabel('Outcome', fontsize=12)
+        for i, v in enumerate(outcome_counts.values):
+            ax.text(i, v, str(v), ha='center', va='bottom', fontsize=12, fontweight='bold')
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, 'chart_01_outcome_distribution.png'), dpi=300, bbox_inches='tight')
+        plt.close()
+
+        # Chart 2
+        fig, ax = plt.subplots(figsize=(10, 7))
+        skill_outcome_plot.plot(kind='barh', ax=ax, color=['#2ecc71', '#e74c3c', '#95a5a6'])
+        ax.set_title('Skill Scores by Outcome', fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel('Average Score', fontsize=12)
+        ax.set_ylabel('Skill Name', fontsize=12)
+        ax.legend(title='Outcome', fontsize=10)
+        ax.invert_yaxis()
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, 'chart_02_skill_scores_by_outcome.png'), dpi=300, bbox_inches='tight')
+        plt.close()
+
+        # Chart 3
+        fig, ax = plt.subplots(figsize=(8, 6))
+        outcome_questions_plot.plot(kind='bar', ax=ax, color=['#3498db', '#9b59b6'])
+        ax.set_title('Average Questions by Outcome', fontsize=16, fontweight='bold', pad=20)
+        ax.set_ylabel('Average Count', fontsize=12)
+        ax.set_xlabel('Outcome', fontsize=12)
+        ax.legend(['Rep Questions', 'Customer Questions'], fontsize=10)
+        ax.tick_params(axis='x', rotation=0)
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, 'chart_03_questions_by_outcome.png'), dpi=300, bbox_inches='tight')
+        plt.close()
+
+        # Chart 4
+        fig, ax = plt.subplots(figsize=(10, 7))
+        ax.barh(range(len(skill_scores)), skill_scores.values, color='#3498db')
+        ax.set_yticks(range(len(skill_scores)))
+        ax.set_yticklabels(skill_scores.index)
+        ax.set_title('Average Skill Scores', fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel('Average Score', fontsize=12)
+        ax.invert_yaxis()
+        for i, v in enumerate(skill_scores.values):
+            ax.text(v + 0.05, i, f'{v:.2f}', va='center', fontsize=10)
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, 'chart_04_average_skill_scores.png'), dpi=300, bbox_inches='tight')
+        plt.close()
+
+        # Chart 5
+        fig, ax = plt.subplots(figsize=(10, 6))
+        user_win_rates = user_stats.sort_values('win_rate', ascending=False)
+        ax.barh(range(len(user_win_rates)), user_win_rates['win_rate'].values, color='#2ecc71')
+        ax.set_yticks(range(len(user_win_rates)))
+        ax.set_yticklabels([uid[:15] + '...' for uid in user_win_rates.index], fontsize=9)
+        ax.set_title('User Win Rates', fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel('Win Rate (%)', fontsize=12)
+        ax.invert_yaxis()
+        for i, v in enumerate(user_win_rates['win_rate'].values):
+            ax.text(v + 1, i, f'{v:.1f}%', va='center', fontsize=10, fontweight='bold')
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, 'chart_05_user_win_rates.png'), dpi=300, bbox_inches='tight')
+        plt.close()
+
+        # Chart 6
+        fig, ax = plt.subplots(figsize=(12, 6))
+        daily_outcomes.sort_index().plot(kind='line', ax=ax, marker='o', color='#e67e22', linewidth=2, markersize=6)
+        ax.set_title('Win Rate Over Time', fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel('Date', fontsize=12)
+        ax.set_ylabel('Win Rate (%)', fontsize=12)
+        ax.grid(True, alpha=0.3)
+        ax.axhline(y=overall_win_rate, color='red', linestyle='--', alpha=0.5, label=f'Overall Average ({overall_win_rate:.0f}%)')
+        ax.legend(fontsize=10)
+        ax.tick_params(axis='x', rotation=45)
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, 'chart_06_win_rate_over_time.png'), dpi=300, bbox_inches='tight')
+        plt.close()
+
+        print("All individual charts saved successfully!")
+
+
+# ============================================================================
+# SECTION 8: ENTRY POINT
+# ============================================================================
+def open_engine(engine_name, recording_path=RECORDING_CSV, scoring_path=SCORING_CSV, quality_dir=None,
+                validate=True):
+    """Create the aggregation engine over validated rows
+
+    pandas loads the data eagerly. duckdb is given the validated frames, or
+    with validate=False queries the raw files directly (out-of-core, but
+    without the quarantine rules).
+    """
+    if engine_name == 'pandas':
+        # Slide 3's score statistics are read from the sketches maintained at ingest. The sketches
+        # only count valid scores, so unvalidated runs aggregate the frames like every other slide
+        sketches = DistributionSketches() if validate else None
+        frames = load_data(recording_path, scoring_path, validate, quality_dir=quality_dir, sketches=sketches)
+        return PandasEngine(*frames, sketches=sketches)
+
+    with span('load') as s:
+        print("Loading data...")
+        sources = (recording_path, scoring_path)
+        if validate:
+            sources = read_inputs(recording_path, scoring_path, quality_dir=quality_dir)
+        engine = ENGINES[engine_name](*sources)
+        counts = engine.row_counts()
+        print(f"Loaded {counts['recordings']} recordings and {counts['evaluations']} skill evaluations")
+        print(f"Merged dataset: {counts['merged']} records")
+        print()
+        s.add_rows(counts['recordings'] + counts['evaluations'])
+    return engine
+
+
+def run_analysis(recording_path=RECORDING_CSV, scoring_path=SCORING_CSV, output_dir='.', charts=True, engine='pandas',
+                 quality_dir=None, validate=True):
+    """Run the Slide 1-5 pipeline for one dataset; returns headline numbers
+
+    quality_dir, if given, receives quarantine.csv, data_quality.json and sketches.json.
+    """
+    print("=" * 80)
+    print("SIRO DS TAKEHOME - MAIN ANALYSIS")
+    print("=" * 80)
+    print()
+
+    engine = open_engine(engine, recording_path, scoring_path, quality_dir=quality_dir, validate=validate)
+    summary = slide1_executive_summary(engine)
+    slide2_skill_scores(engine)
+    skill_stats, discover_why_stats = slide3_discover_why(engine)
+    slide4_question_strategy(engine)
+    user_stats = slide5_rep_variation(engine)
+
+    if charts:
+        create_visualizations(engine, user_stats, summary['overall_win_rate'], output_dir)
+
+    print("\n" + "=" * 80)
+    print("ANALYSIS COMPLETE")
+    print("=" * 80)
+
+    summary.update({
+        'weakest_skill': skill_stats.index[-1],
+        'weakest_skill_score': skill_stats['mean'].iloc[-1],
+        'discover_why_score': discover_why_stats['mean'],
+        'highest_rep_win_rate': user_stats['win_rate'].max(),
+        'lowest_rep_win_rate': user_stats['win_rate'].min(),
+    })
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Siro DS takehome - main analysis (Slides 1-5)")
+    parser.add_argument('--no-charts', action='store_true',
+                        help="print the Slide 1-5 numbers only; never imports matplotlib or seaborn")
+    parser.add_argument('--recording', default=RECORDING_CSV, help="recording metadata CSV")
+    parser.add_argument('--scoring', default=SCORING_CSV, help="skill scoring CSV")
+    parser.add_argument('--output-dir', default='.', help="where charts are written (default: current directory)")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='pandas',
+                        help="pandas (eager, default) or duckdb (multi-threaded SQL)")
+    parser.add_argument('--quality-dir',
+                        help="write quarantine.csv, data_quality.json and sketches.json here (default: not written)")
+    parser.add_argument('--no-validate', action='store_true',
+                        help="skip the quarantine stage; with --engine duckdb the raw files are queried out-of-core")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    run_analysis(args.recording, args.scoring, args.output_dir, charts=not args.no_charts, engine=args.engine,
+                 quality_dir=args.quality_dir, validate=not args.no_validate)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Multi-Tenant Batch Analysis
+Runs the Slide 1-5 pipeline (analysis.run_analysis) for many customer orgs
+
+Tenants come from either:
+- an input directory with one subdirectory per tenant, each holding
+  ds_takehome_recording.csv and ds_takehome_scoring_metadata.csv
+- a manifest CSV with columns tenant, recording, scoring (paths are
+  relative to the manifest's directory)
+
+Tenants run in a process pool. Each worker imports pandas and the analysis
+module once, and pins the Agg chart backend once, then reuses them for every
+tenant it picks up. A failing tenant writes error.txt and is marked failed in
+the summary; the other tenants carry on. With SIRO_PROFILE set, each tenant's
+profile is written to <prefix>_<tenant>_report.json / _trace.json.
+
+Outputs:
+    <output-dir>/<tenant>/analysis_output.txt   printed Slide 1-5 numbers
+    <output-dir>/<tenant>/*.png                 charts (unless --no-charts)
+    <output-dir>/<tenant>/error.txt             traceback, failed tenants only
+    <output-dir>/tenant_summary.csv             one row per tenant
+
+Usage:
+    python batch_analysis.py --input-dir tenants/ --output-dir batch_output/
+    python batch_analysis.py --manifest tenants.csv --workers 8 --no-charts
+"""
+
+import argparse
+import contextlib
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+import profiling
+from analysis import RECORDING_CSV, SCORING_CSV, run_analysis
+from engines import ENGINES
+from profiling import span
+
+
+def discover_tenants(input_dir):
+    """One tenant per subdirectory that contains both input CSVs"""
+    tenants = []
+    for name in sorted(os.listdir(input_dir)):
+        tenant_dir = os.path.join(input_dir, name)
+        recording = os.path.join(tenant_dir, RECORDING_CSV)
+        scoring = os.path.join(tenant_dir, SCORING_CSV)
+        if os.path.isfile(recording) and os.path.isfile(scoring):
+            tenants.append({'tenant': name, 'recording': recording, 'scoring': scoring})
+        elif os.path.isdir(tenant_dir):
+            print(f"Skipping '{name}': missing {RECORDING_CSV} or {SCORING_CSV}")
+    return tenants
+
+
+def read_manifest(manifest_path):
+    """Tenants listed in a CSV manifest with tenant, recording, scoring columns"""
+    manifest = pd.read_csv(manifest_path, dtype=str)
+    missing = {'tenant', 'recording', 'scoring'} - set(manifest.columns)
+    if missing:
+        raise ValueError(f"Manifest {manifest_path} is missing columns: {', '.join(sorted(missing))}")
+    if manifest['tenant'].duplicated().any():
+        raise ValueError(f"Manifest {manifest_path} lists a tenant more than once")
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    return [
+        {
+            'tenant': row.tenant,
+            'recording': os.path.join(base_dir, row.recording),
+            'scoring': os.path.join(base_dir, row.scoring),
+        }
+        for row in manifest.itertuples(index=False)
+    ]
+
+
+def _init_worker(charts):
+    """Warm each worker once: analysis module, pandas and (optionally) the chart stack"""
+    import warnings
+    warnings.filterwarnings('ignore')
+    import analysis  # noqa: F401
+    if charts:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot  # noqa: F401
+        import seaborn  # noqa: F401
+
+
+def run_tenant(tenant, output_root, charts, engine='pandas'):
+    """Run one tenant; never raises, so a bad tenant cannot take down the batch"""
+    tenant_dir = os.path.join(output_root, tenant['tenant'])
+    os.makedirs(tenant_dir, exist_ok=True)
+    start = time.perf_counter()
+    row = {'tenant': tenant['tenant']}
+    # With SIRO_PROFILE set, each tenant gets its own <prefix>_<tenant>_*.json files
+    profiler = profiling.restart(tenant['tenant'])
+    with open(os.path.join(tenant_dir, 'analysis_output.txt'), 'w') as out:
+        try:
+            with contextlib.redirect_stdout(out):
+                summary = run_analysis(tenant['recording'], tenant['scoring'], tenant_dir, charts=charts, engine=engine,
+                                       quality_dir=tenant_dir)
+            row.update(status='ok', error=None)
+            row.update(summary)
+        except Exception as e:
+            with open(os.path.join(tenant_dir, 'error.txt'), 'w') as f:
+                f.write(traceback.format_exc())
+            row.update(status='failed', error=f"{type(e).__name__}: {e}")
+        finally:
+            # Pool workers may exit without running atexit, so write now
+            if profiler is not None:
+                with contextlib.redirect_stdout(out):
+                    profiler.write()
+    row['elapsed_s'] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def run_batch(tenants, output_root, workers=None, charts=True, engine='pandas'):
+    """Run all tenants in a process pool and write the cross-tenant summary"""
+    os.makedirs(output_root, exist_ok=True)
+    rows = []
+    with span('batch') as s:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(charts,)) as pool:
+            futures = {pool.submit(run_tenant, tenant, output_root, charts, engine): tenant for tenant in tenants}
+            for future in as_completed(futures):
+                tenant = futures[future]
+                try:
+                    row = future.result()
+                except Exception as e:
+                    # Only reached if the worker process itself died (e.g. OOM kill)
+                    row = {'tenant': tenant['tenant'], 'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+                print(f"  {row['tenant']}: {row['status']}" + (f" ({row['error']})" if row.get('error') else ''))
+                rows.append(row)
+        s.add_rows(len(tenants))
+
+    summary = pd.DataFrame(rows).sort_values('tenant').reset_index(drop=True).convert_dtypes()
+    summary_path = os.path.join(output_root, 'tenant_summary.csv')
+    summary.round(2).to_csv(summary_path, index=False)
+    return summary, summary_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Slide 1-5 analysis for many tenants in parallel")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--input-dir', help="directory with one subdirectory of CSVs per tenant")
+    source.add_argument('--manifest', help="CSV with tenant, recording, scoring columns")
+    parser.add_argument('--output-dir', default='batch_output')
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--no-charts', action='store_true', help="skip charts; workers never import matplotlib")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='pandas', help="aggregation engine per tenant")
+    args = parser.parse_args(argv)
+
+    tenants = discover_tenants(args.input_dir) if args.input_dir else read_manifest(args.manifest)
+    if not tenants:
+        print("No tenants found.")
+        return
+
+    print("=" * 80)
+    print(f"BATCH ANALYSIS: {len(tenants)} TENANTS")
+    print("=" * 80)
+    summary, summary_path = run_batch(tenants, args.output_dir, args.workers, charts=not args.no_charts,
+                                     engine=args.engine)
+
+    failed = (summary['status'] != 'ok').sum()
+    print(f"\n{len(summary) - failed} succeeded, {failed} failed")
+    print(f"Cross-tenant summary saved to '{summary_path}'")
+
+
+if __name__ == '__main__':
+    main()
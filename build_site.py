@@ -0,0 +1,633 @@
+"""
+Static Site Build for the GitHub Pages Deck
+Minified, asset-hashed copy of index.html and slide*.html for fast mobile loads
+
+For every page:
+- HTML, inline CSS and inline JS are minified. Only whitespace and comments
+  are removed, and JS is stripped line by line, never rewritten.
+- Local images become <picture> elements with AVIF and WebP variants at
+  several widths plus a resized PNG fallback. Variants are generated in a
+  process pool and need Pillow.
+- Images below the first slide are lazy-loaded. In index.html (reveal.js)
+  that is every slide after the first, and iframes there switch to
+  data-src so reveal.js loads them near the current slide.
+- Local images, stylesheets and scripts are written as
+  assets/<name>.<hash>.<ext>, so they can be cached forever.
+- Stylesheets whose CSS is available (local files, or CDN sheets cached in
+  --vendor-dir) are split. Rules matching the page's classes are inlined as
+  critical CSS, and the full sheet then loads without blocking render.
+
+Rebuilds are incremental. .build-manifest.json in the output directory
+records a content hash per page and image, and only changed inputs are
+rebuilt. Hashed assets that no page references any more are removed.
+
+Usage:
+    python build_site.py                              # builds into _site/
+    python build_site.py --output docs --workers 4    # GitHub Pages can serve /docs
+    python build_site.py --vendor-dir vendor --fetch-vendor
+"""
+
+import argparse
+import glob
+import hashlib
+import html
+import io
+import json
+import os
+import posixpath
+import re
+import shutil
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from profiling import span
+
+PAGES = ['index.html', 'slide*.html']
+DECK_PAGE = 'index.html'
+ASSETS_DIR = 'assets'
+MANIFEST_FILE = '.build-manifest.json'
+# Bump when the output format changes, so every input is rebuilt once
+BUILD_VERSION = 1
+
+IMAGE_WIDTHS = (480, 960, 1600)
+IMAGE_FORMATS = {'avif': {'quality': 55}, 'webp': {'quality': 85, 'method': 6}}
+IMAGE_SIZES = '(max-width: 1280px) 100vw, 1280px'
+
+# Stylesheets served per user agent (web fonts); loaded asynchronously but never inlined
+ASYNC_ONLY_HOSTS = ('fonts.googleapis.com',)
+# Classes reveal.js adds at runtime, kept in the critical CSS of the deck
+RUNTIME_CLASSES = {'reveal', 'slides', 'present', 'past', 'future', 'ready', 'visible', 'stack', 'backgrounds'}
+
+BLOCK_TAGS = {
+    'html', 'head', 'body', 'title', 'meta', 'link', 'script', 'style', 'noscript', 'div', 'section', 'p',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'table', 'thead', 'tbody', 'tr', 'td', 'th',
+    'header', 'footer', 'main', 'nav', 'canvas', 'br', 'hr',
+}
+RAW_TAGS = {'script', 'style', 'pre', 'textarea'}
+
+
+def content_hash(data, length=10):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def is_local(url):
+    return bool(url) and not re.match(r'^(?:[a-z][a-z0-9+.-]*:|//|#)', url, re.I)
+
+
+def hashed_name(path, data, suffix='', ext=None):
+    """assets/<stem><suffix>.<hash>.<ext> for a source path and its output bytes"""
+    stem, source_ext = os.path.splitext(os.path.basename(path))
+    return posixpath.join(ASSETS_DIR, f"{stem}{suffix}.{content_hash(data)}{ext or source_ext}")
+
+
+def write_output(output_dir, rel_path, data):
+    path = os.path.join(output_dir, rel_path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data.encode('utf-8') if isinstance(data, str) else data)
+    return rel_path
+
+
+# ============================================================================
+# CSS AND JS MINIFICATION
+# ============================================================================
+def minify_css(css):
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    # Spaces around ':' are left alone: 'a :hover' and 'a:hover' are different selectors
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_js(js):
+    """Drop indentation, blank lines and whole-line // comments; line breaks stay for ASI"""
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+
+def rebase_urls(css, base):
+    """Rewrite local url(...) references in a stylesheet with base(url)"""
+    def repl(match):
+        url = match.group(2)
+        if not is_local(url):
+            return match.group(0)
+        return f"url({match.group(1)}{base(url)}{match.group(1)})"
+    return re.sub(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)', repl, css)
+
+
+def _css_blocks(css):
+    """Split CSS into top-level (prelude, body) pairs; body is None for ';' statements"""
+    blocks, i, n = [], 0, len(css)
+    while i < n:
+        start = i
+        while i < n and css[i] not in '{;':
+            i += 1
+        prelude = css[start:i].strip()
+        if i >= n:
+            break
+        if css[i] == ';':
+            blocks.append((prelude, None))
+            i += 1
+            continue
+        depth, quote, i = 1, None, i + 1
+        body_start = i
+        while i < n and depth:
+            ch = css[i]
+            if quote:
+                if ch == '\\':
+                    i += 1
+                elif ch == quote:
+                    quote = None
+            elif ch in '"\'':
+                quote = ch
+            elif ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+            i += 1
+        blocks.append((prelude, css[body_start:i - 1]))
+    return blocks
+
+
+def _selector_used(selector, classes):
+    found = re.findall(r'\.(-?[_a-zA-Z](?:\\.|[\w-])*)', selector)
+    return all(re.sub(r'\\(.)', r'\1', name) in classes for name in found)
+
+
+def critical_css(css, classes):
+    """Rules whose class selectors all appear in the page (plus at-rules such as @font-face)"""
+    kept = []
+    for prelude, body in _css_blocks(re.sub(r'/\*.*?\*/', '', css, flags=re.S)):
+        if body is None:
+            if not prelude.lower().startswith('@import'):
+                kept.append(prelude + ';')
+        elif prelude.startswith(('@media', '@supports')):
+            inner = critical_css(body, classes)
+            if inner:
+                kept.append(f"{prelude}{{{inner}}}")
+        elif prelude.startswith('@'):
+            kept.append(f"{prelude}{{{body}}}")
+        else:
+            selectors = [s for s in prelude.split(',') if _selector_used(s, classes)]
+            if selectors:
+                kept.append(f"{','.join(selectors)}{{{body}}}")
+    return minify_css(''.join(kept))
+
+
+# ============================================================================
+# RESPONSIVE IMAGE VARIANTS
+# ============================================================================
+def make_image_variants(source_path, rel_path, output_dir):
+    """Write AVIF/WebP variants and a PNG fallback for one image; returns their metadata"""
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("Image variants need Pillow: pip install Pillow") from None
+
+    with Image.open(source_path) as original:
+        original.load()
+        image = original.convert('RGBA') if original.mode not in ('RGB', 'RGBA') else original.copy()
+    widths = sorted({min(w, image.width) for w in IMAGE_WIDTHS})
+    info = {'variants': {}, 'outputs': []}
+
+    for width in widths:
+        resized = image if width == image.width else image.resize(
+            (width, round(image.height * width / image.width)), Image.LANCZOS)
+        for fmt, options in IMAGE_FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, fmt.upper(), **options)
+            path = hashed_name(rel_path, buffer.getvalue(), f'-{width}', f'.{fmt}')
+            info['outputs'].append(write_output(output_dir, path, buffer.getvalue()))
+            info['variants'].setdefault(fmt, []).append([width, path])
+        if width == widths[-1]:
+            buffer = io.BytesIO()
+            resized.save(buffer, 'PNG', optimize=True)
+            info['fallback'] = write_output(output_dir, hashed_name(rel_path, buffer.getvalue(), f'-{width}', '.png'),
+                                            buffer.getvalue())
+            info['outputs'].append(info['fallback'])
+            info['width'], info['height'] = resized.size
+    return info
+
+
+# ============================================================================
+# PAGE SCANNING AND REWRITING
+# ============================================================================
+class _Scanner(HTMLParser):
+    """Collects the references and class names a page uses"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.images, self.stylesheets, self.scripts = [], [], []
+        self.classes = set()
+        self._in_script = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        self.classes.update((attrs.get('class') or '').split())
+        if tag == 'img' and is_local(attrs.get('src')):
+            self.images.append(attrs['src'])
+        elif tag == 'link' and 'stylesheet' in (attrs.get('rel') or '').split() and attrs.get('href'):
+            self.stylesheets.append(attrs['href'])
+        elif tag == 'script':
+            self._in_script = True
+            if is_local(attrs.get('src')):
+                self.scripts.append(attrs['src'])
+
+    def handle_endtag(self, tag):
+        if tag == 'script':
+            self._in_script = False
+
+    def handle_data(self, data):
+        # Class names set from JS (classList.add('x'), className = 'a b') count as used
+        if self._in_script:
+            for literal in re.findall(r'[\'"`]([\w\s:/.-]+)[\'"`]', data):
+                self.classes.update(literal.split())
+
+
+def _format_tag(tag, attrs, close=False):
+    parts = [tag]
+    for name, value in attrs:
+        parts.append(name if value is None else f'{name}="{html.escape(value, quote=True)}"')
+    return f"<{' '.join(parts)}{'/' if close else ''}>"
+
+
+class _Rewriter(HTMLParser):
+    """Re-emits a page minified, with references swapped for built assets"""
+
+    def __init__(self, is_deck, images, stylesheets, assets):
+        super().__init__(convert_charrefs=False)
+        self.is_deck = is_deck
+        self.images = images
+        self.stylesheets = stylesheets
+        self.assets = assets
+        self.out = []
+        self.raw = None
+        self.strip_next = False
+        self.section_depth = 0
+        self.slide_index = 0
+        self.image_count = 0
+
+    # Whitespace next to block-level tags never renders
+    def _emit_block(self, text):
+        if self.out and not self.out[-1].strip():
+            self.out.pop()
+        self.out.append(text)
+        self.strip_next = True
+
+    def _emit(self, tag, text):
+        if tag in BLOCK_TAGS:
+            self._emit_block(text)
+        else:
+            self.out.append(text)
+            self.strip_next = False
+
+    def _off_screen(self):
+        if self.is_deck:
+            return self.slide_index > 1
+        return self.image_count > 1
+
+    def handle_decl(self, decl):
+        self._emit_block(f"<!{decl}>")
+
+    def handle_comment(self, data):
+        if data.startswith('[if'):
+            self.out.append(f"<!--{data}-->")
+
+    def handle_starttag(self, tag, attrs, close=False):
+        attrs = list(attrs)
+        values = dict(attrs)
+        if tag == 'section' and self.is_deck:
+            if self.section_depth == 0:
+                self.slide_index += 1
+            self.section_depth += 1
+
+        if tag == 'img':
+            self.image_count += 1
+            src = values.get('src')
+            if src in self.images:
+                self._emit('img', self._picture(attrs, self.images[src]))
+                return
+            if self._off_screen() and 'loading' not in values:
+                attrs.append(('loading', 'lazy'))
+        elif tag == 'iframe' and self.is_deck and self._off_screen() and 'src' in values:
+            attrs = [('data-src' if name == 'src' else name, value) for name, value in attrs]
+        elif tag == 'link' and values.get('href') in self.stylesheets:
+            self._emit('link', self._stylesheet(values['href'], attrs))
+            return
+        elif tag == 'script' and values.get('src') in self.assets:
+            attrs = [(name, self.assets[value] if name == 'src' else value) for name, value in attrs]
+
+        if tag in RAW_TAGS and not close:
+            self.raw = tag
+        self._emit(tag, _format_tag(tag, attrs, close))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, close=True)
+
+    def handle_endtag(self, tag):
+        if tag == self.raw:
+            self.raw = None
+        if tag == 'section' and self.is_deck:
+            self.section_depth -= 1
+        self._emit(tag, f"</{tag}>")
+
+    def handle_data(self, data):
+        if self.raw == 'script':
+            data = minify_js(data)
+        elif self.raw == 'style':
+            data = minify_css(data)
+        elif self.raw is None:
+            data = re.sub(r'\s+', ' ', data)
+            if self.strip_next:
+                data = data.lstrip()
+        if data:
+            self.out.append(data)
+            self.strip_next = False
+
+    def handle_entityref(self, name):
+        self.out.append(f"&{name};")
+        self.strip_next = False
+
+    def handle_charref(self, name):
+        self.out.append(f"&#{name};")
+        self.strip_next = False
+
+    def _picture(self, attrs, info):
+        # Author-set width/height win; otherwise the fallback's size reserves the right aspect ratio
+        values = dict(attrs)
+        img_attrs = [(n, v) for n, v in attrs if n not in ('src', 'loading', 'decoding')]
+        if 'width' not in values and 'height' not in values:
+            img_attrs += [('width', str(info['width'])), ('height', str(info['height']))]
+        img_attrs += [
+            ('src', info['fallback']),
+            ('loading', 'lazy' if self._off_screen() else 'eager'),
+            ('decoding', 'async'),
+        ]
+        sources = ''.join(
+            _format_tag('source', [
+                ('type', f'image/{fmt}'),
+                ('srcset', ', '.join(f"{path} {width}w" for width, path in variants)),
+                ('sizes', IMAGE_SIZES),
+            ])
+            for fmt, variants in info['variants'].items()
+        )
+        return f"<picture>{sources}{_format_tag('img', img_attrs)}</picture>"
+
+    def _stylesheet(self, href, attrs):
+        critical, full_href = self.stylesheets[href]
+        rest = [(n, v) for n, v in attrs if n not in ('rel', 'href', 'onload', 'as')]
+        preload = _format_tag('link', [('rel', 'preload'), ('as', 'style'), ('href', full_href)] + rest
+                              + [('onload', "this.onload=null;this.rel='stylesheet'")])
+        fallback = _format_tag('link', [('rel', 'stylesheet'), ('href', full_href)] + rest)
+        inline = f"<style>{critical}</style>" if critical else ''
+        return f"{inline}{preload}<noscript>{fallback}</noscript>"
+
+    def result(self):
+        return ''.join(self.out).strip() + '\n'
+
+
+# ============================================================================
+# BUILD
+# ============================================================================
+def vendor_path(vendor_dir, url):
+    return os.path.join(vendor_dir, content_hash(url, 16) + '.css')
+
+
+def fetch_vendor(urls, vendor_dir):
+    """Download remote stylesheets into the vendor cache (only needed once per URL)"""
+    os.makedirs(vendor_dir, exist_ok=True)
+    for url in urls:
+        path = vendor_path(vendor_dir, url)
+        if os.path.exists(path) or any(host in url for host in ASYNC_ONLY_HOSTS):
+            continue
+        try:
+            with urllib.request.urlopen(urljoin('https:', url), timeout=30) as response:
+                data = response.read()
+        except OSError as e:
+            print(f"  Could not fetch {url}: {e}")
+            continue
+        with open(path, 'wb') as f:
+            f.write(data)
+        print(f"  Cached {url}")
+
+
+class SiteBuilder:
+    """Builds the pages in source_dir into output_dir, reusing unchanged outputs"""
+
+    def __init__(self, source_dir='.', output_dir='_site', vendor_dir=None, workers=None):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.vendor_dir = vendor_dir
+        self.workers = workers
+        manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+        self.previous = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') == BUILD_VERSION:
+                self.previous = manifest['entries']
+        self.entries = {}
+        self.stats = {'pages': 0, 'pages_reused': 0, 'images': 0, 'images_reused': 0,
+                      'source_bytes': 0, 'output_bytes': 0}
+
+    def pages(self):
+        found = []
+        for pattern in PAGES:
+            found += sorted(os.path.basename(p) for p in glob.glob(os.path.join(self.source_dir, pattern)))
+        return list(dict.fromkeys(found))
+
+    def _source(self, rel_path):
+        return os.path.join(self.source_dir, *posixpath.normpath(rel_path).split('/'))
+
+    def _reusable(self, entry_id, key):
+        entry = self.previous.get(entry_id)
+        if entry and entry['key'] == key and all(
+                os.path.exists(os.path.join(self.output_dir, p)) for p in entry['outputs']):
+            self.entries[entry_id] = entry
+            return entry
+        return None
+
+    def build(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        scans = {}
+        for page in self.pages():
+            scanner = _Scanner()
+            with open(self._source(page), encoding='utf-8') as f:
+                scanner.feed(f.read())
+            scans[page] = scanner
+
+        with span('site_images') as s:
+            images = self.build_images({src for scan in scans.values() for src in scan.images})
+            s.add_rows(len(images))
+        with span('site_pages') as s:
+            for page, scan in scans.items():
+                self.build_page(page, scan, images)
+            s.add_rows(len(scans))
+
+        self.entries['file:.nojekyll'] = {'key': '', 'outputs': [write_output(self.output_dir, '.nojekyll', b'')]}
+        self._remove_stale()
+        with open(os.path.join(self.output_dir, MANIFEST_FILE), 'w') as f:
+            json.dump({'version': BUILD_VERSION, 'entries': self.entries}, f, indent=2, sort_keys=True)
+        return self.stats
+
+    def build_images(self, sources):
+        """Variants for every referenced image, regenerating only changed ones in parallel"""
+        images, pending = {}, {}
+        config = json.dumps([IMAGE_WIDTHS, IMAGE_FORMATS], sort_keys=True)
+        for src in sorted(sources):
+            path = self._source(src)
+            if not os.path.exists(path):
+                print(f"  Missing image {src}; left as is")
+                continue
+            with open(path, 'rb') as f:
+                key = content_hash(f.read() + config.encode(), 64)
+            entry = self._reusable(f'image:{src}', key)
+            if entry:
+                images[src] = entry['meta']
+                self.stats['images_reused'] += 1
+            else:
+                pending[src] = key
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = {src: pool.submit(make_image_variants, self._source(src), src, self.output_dir)
+                           for src in pending}
+                for src, future in futures.items():
+                    info = future.result()
+                    images[src] = info
+                    self.entries[f'image:{src}'] = {'key': pending[src], 'outputs': info['outputs'], 'meta': info}
+        self.stats['images'] = len(images)
+        return images
+
+    def _copy_asset(self, rel_path, outputs):
+        """Hashed copy of a file a stylesheet refers to (fonts, background images), or None if missing"""
+        path = self._source(rel_path)
+        if not os.path.isfile(path):
+            return None
+        with open(path, 'rb') as f:
+            data = f.read()
+        asset = write_output(self.output_dir, hashed_name(rel_path, data), data)
+        outputs.append(asset)
+        return asset
+
+    def _stylesheet(self, href, classes, outputs):
+        """(critical CSS, href of the full sheet) for a stylesheet link, or None to leave it alone"""
+        if any(host in href for host in ASYNC_ONLY_HOSTS):
+            return '', href
+        if is_local(href):
+            path = self._source(href)
+            if not os.path.exists(path):
+                return None
+            with open(path, encoding='utf-8') as f:
+                css = f.read()
+            # Files the sheet refers to are copied to assets/ too; the inline copy points at them from the page
+            base_dir = posixpath.dirname(posixpath.normpath(href))
+            copied = {}
+
+            def asset_for(url):
+                target, query = re.match(r'([^?#]*)(.*)', url).groups()
+                target = posixpath.normpath(posixpath.join(base_dir, target))
+                if target not in copied:
+                    copied[target] = self._copy_asset(target, outputs)
+                return (copied[target] or target) + query
+
+            inline = rebase_urls(css, asset_for)
+            moved = rebase_urls(css, lambda u: posixpath.relpath(asset_for(u), ASSETS_DIR))
+            full = minify_css(moved)
+            asset = write_output(self.output_dir, hashed_name(href, full), full)
+            outputs.append(asset)
+            return critical_css(inline, classes), asset
+        if self.vendor_dir and os.path.exists(vendor_path(self.vendor_dir, href)):
+            with open(vendor_path(self.vendor_dir, href), encoding='utf-8') as f:
+                css = f.read()
+            absolute = urljoin('https:', href)
+            return critical_css(rebase_urls(css, lambda u: urljoin(absolute, u)), classes), href
+        return None
+
+    def build_page(self, page, scan, images):
+        with open(self._source(page), encoding='utf-8') as f:
+            source = f.read()
+        classes = scan.classes | (RUNTIME_CLASSES if page == DECK_PAGE else set())
+
+        outputs = [page]
+        stylesheets = {}
+        for href in scan.stylesheets:
+            resolved = self._stylesheet(href, classes, outputs)
+            if resolved is not None:
+                stylesheets[href] = resolved
+        assets = {}
+        for src in scan.scripts:
+            path = self._source(src)
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    js = minify_js(f.read())
+                assets[src] = write_output(self.output_dir, hashed_name(src, js), js)
+                outputs.append(assets[src])
+
+        refs = {'images': {src: images[src] for src in scan.images if src in images},
+                'stylesheets': stylesheets, 'assets': assets}
+        key = content_hash(source + json.dumps(refs, sort_keys=True), 64)
+        self.stats['pages'] += 1
+        self.stats['source_bytes'] += len(source.encode('utf-8'))
+
+        if self._reusable(f'page:{page}', key):
+            self.stats['pages_reused'] += 1
+        else:
+            rewriter = _Rewriter(page == DECK_PAGE, refs['images'], stylesheets, assets)
+            rewriter.feed(source)
+            rewriter.close()
+            write_output(self.output_dir, page, rewriter.result())
+            self.entries[f'page:{page}'] = {'key': key, 'outputs': outputs}
+        self.stats['output_bytes'] += os.path.getsize(os.path.join(self.output_dir, page))
+
+    def _remove_stale(self):
+        """Delete outputs of previous builds that this build no longer produces"""
+        current = {p for entry in self.entries.values() for p in entry['outputs']}
+        for entry in self.previous.values():
+            for rel_path in entry['outputs']:
+                path = os.path.join(self.output_dir, rel_path)
+                if rel_path not in current and os.path.exists(path):
+                    os.remove(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the minified, asset-hashed GitHub Pages site")
+    parser.add_argument('--source', default='.', help="directory with index.html and slide*.html")
+    parser.add_argument('--output', default='_site')
+    parser.add_argument('--workers', type=int, help="image worker processes (default: CPU count)")
+    parser.add_argument('--vendor-dir', help="cached CDN stylesheets to inline critical CSS from")
+    parser.add_argument('--fetch-vendor', action='store_true', help="download missing CDN stylesheets first")
+    parser.add_argument('--clean', action='store_true', help="delete the output directory and rebuild everything")
+    args = parser.parse_args(argv)
+
+    if args.clean and os.path.isdir(args.output):
+        shutil.rmtree(args.output)
+    builder = SiteBuilder(args.source, args.output, args.vendor_dir, args.workers)
+    if args.fetch_vendor:
+        if not args.vendor_dir:
+            parser.error("--fetch-vendor needs --vendor-dir")
+        urls = set()
+        for page in builder.pages():
+            scanner = _Scanner()
+            with open(builder._source(page), encoding='utf-8') as f:
+                scanner.feed(f.read())
+            urls.update(href for href in scanner.stylesheets if not is_local(href))
+        fetch_vendor(sorted(urls), args.vendor_dir)
+
+    start = time.perf_counter()
+    stats = builder.build()
+    print(f"Built {stats['pages']} pages ({stats['pages_reused']} unchanged) and "
+          f"{stats['images']} images ({stats['images_reused']} unchanged) into '{args.output}' "
+          f"in {time.perf_counter() - start:.2f}s")
+    if stats['source_bytes']:
+        print(f"HTML: {stats['source_bytes']:,} -> {stats['output_bytes']:,} bytes "
+              f"({100 * stats['output_bytes'] / stats['source_bytes']:.0f}% of the source)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Engine parity check
+Runs every aggregation on the pandas and DuckDB engines and compares results
+
+Exits with status 1 on any mismatch. Floating point values are compared with
+a tight relative tolerance (DuckDB sums in parallel, so the last bits of a
+mean can differ); counts, labels and ordering must match exactly.
+
+Both engines see validated rows by default, as in analysis.py; --no-validate
+compares them over the raw files instead.
+
+Usage:
+    python check_engine_parity.py
+    python check_engine_parity.py --recording r.csv --scoring s.csv
+    python check_engine_parity.py --no-validate
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import sys
+
+import pandas as pd
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from analysis import RECORDING_CSV, SCORING_CSV, open_engine
+
+RTOL = 1e-9
+
+CHECKS = [
+    'headline',
+    'weekly_win_rates',
+    'daily_win_rates',
+    'skill_outcome_scores',
+    'skill_stats',
+    'skill_focus_stats',
+    'outcome_counts',
+    'outcome_questions',
+    'user_stats',
+]
+
+
+def compare(expected, actual):
+    """Raise AssertionError if two engine results differ"""
+    if isinstance(expected, pd.DataFrame):
+        assert_frame_equal(expected, actual, check_dtype=False, check_names=False, rtol=RTOL)
+    elif isinstance(expected, pd.Series):
+        assert_series_equal(expected, actual, check_dtype=False, check_names=False, rtol=RTOL)
+    elif isinstance(expected, dict):
+        assert expected.keys() == actual.keys(), f"keys differ: {sorted(expected)} vs {sorted(actual)}"
+        for key in expected:
+            a, b = expected[key], actual[key]
+            if isinstance(a, float) or isinstance(b, float):
+                both_nan = a is not None and b is not None and math.isnan(a) and math.isnan(b)
+                assert both_nan or math.isclose(a, b, rel_tol=RTOL), f"{key}: {a!r} vs {b!r}"
+            else:
+                assert a == b, f"{key}: {a!r} vs {b!r}"
+    else:
+        raise TypeError(f"Don't know how to compare {type(expected).__name__}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that the pandas and duckdb engines agree")
+    parser.add_argument('--recording', default=RECORDING_CSV)
+    parser.add_argument('--scoring', default=SCORING_CSV)
+    parser.add_argument('--no-validate', action='store_true', help="compare the engines over unvalidated rows")
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        pandas_engine, duckdb_engine = (
+            open_engine(name, args.recording, args.scoring, validate=not args.no_validate)
+            for name in ('pandas', 'duckdb'))
+
+    failures = 0
+    for check in CHECKS:
+        try:
+            compare(getattr(pandas_engine, check)(), getattr(duckdb_engine, check)())
+            print(f"  ok    {check}")
+        except AssertionError as e:
+            failures += 1
+            print(f"  FAIL  {check}: {e}")
+
+    if failures:
+        print(f"\n{failures} of {len(CHECKS)} aggregations differ between engines")
+        sys.exit(1)
+    print(f"\nAll {len(CHECKS)} aggregations match")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Startup budget check for the stats-only analysis path
+Exits with status 1 if the budget is exceeded, so it can gate CI or job images
+
+Two checks, both measured with `python -X importtime` in a fresh interpreter:
+- Importing analysis.py must not pull in matplotlib, seaborn or openai, and
+  its total import time must stay under the budget
+- With --data-dir, a full `analysis.py --no-charts` run in that directory
+  must not import matplotlib or seaborn at any point
+
+Usage:
+    python check_startup.py
+    python check_startup.py --budget-ms 600 --data-dir /path/to/csvs
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ('matplotlib', 'seaborn', 'openai')
+
+
+def parse_importtime(stderr):
+    """Return (total import seconds, set of top-level package names imported)"""
+    total_us = 0
+    packages = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented under their parent; only count roots
+        if not name.startswith('  '):
+            total_us += int(cumulative)
+        packages.add(name.strip().split('.')[0])
+    return total_us / 1e6, packages
+
+
+def run_importtime(args, cwd):
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    env.pop('SIRO_PROFILE', None)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + args,
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the stats-only startup budget")
+    parser.add_argument('--budget-ms', type=float, default=1000,
+                        help="maximum import time for analysis.py (default: 1000)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="take the best of this many fresh interpreters (default: 3)")
+    parser.add_argument('--data-dir', help="also run analysis.py --no-charts against the CSVs in this directory")
+    args = parser.parse_args(argv)
+
+    failures = []
+
+    timings = []
+    for _ in range(args.repeat):
+        seconds, packages = run_importtime(['-c', 'import analysis'], cwd=REPO_DIR)
+        timings.append(seconds)
+        leaked = sorted(packages.intersection(HEAVY_MODULES))
+        if leaked:
+            failures.append(f"import analysis pulled in: {', '.join(leaked)}")
+            break
+    best_ms = min(timings) * 1000
+    print(f"import analysis: {best_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if best_ms > args.budget_ms:
+        failures.append(f"import analysis took {best_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+
+    if args.data_dir:
+        seconds, packages = run_importtime([os.path.join(REPO_DIR, 'analysis.py'), '--no-charts'], cwd=args.data_dir)
+        print(f"analysis.py --no-charts: {seconds * 1000:.0f} ms of imports")
+        leaked = sorted(packages.intersection(('matplotlib', 'seaborn')))
+        if leaked:
+            failures.append(f"analysis.py --no-charts imported: {', '.join(leaked)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("Startup budget OK")
+
+
+if __name__ == '__main__':
+    main()
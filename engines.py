@@ -0,0 +1,428 @@
+"""
+Aggregation engines for the Slide 1-5 analysis
+Each engine answers the same questions; analysis.py only formats the results
+
+- PandasEngine: eager pandas over frames from analysis.load_data (the default);
+  given the DistributionSketches built at ingest, Slide 3's per-skill score
+  statistics are read from the score histograms instead of the frames
+- DuckDBEngine: multi-threaded SQL over validated frames (analysis.open_engine
+  passes validation's output, so both engines see the same rows) or, unvalidated,
+  directly over CSV or Parquet files. Each input is loaded once into a DuckDB
+  temp table (which spills to disk when larger than RAM) and every query runs
+  against that.
+  Needs the optional duckdb package (pip install duckdb).
+
+Both engines hand back pandas objects shaped exactly like the original
+analysis code built them; the final shaping (unstack, rounding, sorting) is
+shared so the two engines print identical numbers.
+"""
+
+import os
+
+import pandas as pd
+from sketches import ScoreHistogram, skill_score_stats
+
+# Period boundaries used for the early vs late comparison (Slides 1 and 6)
+EARLY_PERIOD_END = '2025-08-15'
+LATE_PERIOD_START = '2025-09-15'
+
+DISCOVER_WHY = 'Discover the "Why"'
+
+USER_STATS_COLUMNS = ['num_recordings', 'wins', 'avg_duration_min', 'avg_words',
+                      'avg_rep_questions', 'avg_customer_questions']
+
+
+# ============================================================================
+# SHARED SHAPING
+# ============================================================================
+def _shape_skill_outcome(long_df):
+    """(skillName, outcome, score) rows -> skill x outcome table of means"""
+    return long_df.set_index(['skillName', 'outcome'])['score'].unstack()
+
+
+def _shape_skill_stats(skill_stats):
+    return skill_stats.sort_values('mean', ascending=False)
+
+
+def _shape_user_stats(user_stats, user_skill_scores):
+    user_stats = user_stats.round(2)
+    user_stats.columns = USER_STATS_COLUMNS
+    user_stats['win_rate'] = (user_stats['wins'] / user_stats['num_recordings'] * 100).round(2)
+    user_stats['avg_skill_score'] = user_skill_scores.round(2)
+    return user_stats.sort_values('win_rate', ascending=False)
+
+
+# ============================================================================
+# PANDAS ENGINE
+# ============================================================================
+class PandasEngine:
+    """Eager pandas aggregations over already-loaded frames"""
+
+    name = 'pandas'
+
+    def __init__(self, recording_df, scoring_df, merged_df, sketches=None):
+        self.recording_df = recording_df
+        self.scoring_df = scoring_df
+        self.merged_df = merged_df
+        self.sketches = sketches
+
+    def row_counts(self):
+        return {
+            'recordings': len(self.recording_df),
+            'evaluations': len(self.scoring_df),
+            'merged': len(self.merged_df),
+        }
+
+    def headline(self):
+        """Slide 1 totals plus the early vs late period comparison"""
+        recording_df, scoring_df, merged_df = self.recording_df, self.scoring_df, self.merged_df
+        dates = recording_df['dateCreated'].dt.date
+        early_period = recording_df[dates <= pd.to_datetime(EARLY_PERIOD_END).date()]
+        late_period = recording_df[dates >= pd.to_datetime(LATE_PERIOD_START).date()]
+        score_dates = merged_df['recordingdate'].dt.date
+        return {
+            'total_recordings': len(recording_df),
+            'total_users': recording_df['userId'].nunique(),
+            'total_evaluations': len(scoring_df),
+            'unique_skills': scoring_df['skillName'].nunique(),
+            'overall_win_rate': (recording_df['outcome'] == 'won').sum() / len(recording_df) * 100,
+            'avg_duration': recording_df['duration_minutes'].mean(),
+            'avg_skill_score': scoring_df['score'].mean(),
+            'first_date': recording_df['dateCreated'].min().date(),
+            'last_date': recording_df['dateCreated'].max().date(),
+            'first_week_win_rate': (early_period['outcome'] == 'won').sum() / len(early_period) * 100,
+            'last_week_win_rate': (late_period['outcome'] == 'won').sum() / len(late_period) * 100,
+            'early_scores': merged_df[score_dates <= pd.to_datetime(EARLY_PERIOD_END).date()]['score'].mean(),
+            'late_scores': merged_df[score_dates >= pd.to_datetime(LATE_PERIOD_START).date()]['score'].mean(),
+        }
+
+    def weekly_win_rates(self):
+        """Win rate per calendar week (Monday-Sunday) with a 'start/end' label"""
+        recording_df = self.recording_df
+        weekly_win_rates = recording_df.groupby(recording_df['dateCreated'].dt.to_period('W')).apply(
+            lambda x: (x['outcome'] == 'won').sum() / len(x) * 100
+        ).reset_index()
+        weekly_win_rates.columns = ['week', 'win_rate']
+        weekly_win_rates['week_str'] = weekly_win_rates['week'].astype(str)
+        return weekly_win_rates[['week_str', 'win_rate']]
+
+    def daily_win_rates(self):
+        recording_df = self.recording_df
+        return recording_df.groupby(recording_df['dateCreated'].dt.date.rename('date'))['outcome'].apply(
+            lambda x: (x == 'won').sum() / len(x) * 100
+        )
+
+    def skill_outcome_scores(self):
+        """Mean score per skill and outcome (NaN where a pair never occurs)"""
+        return self.merged_df.groupby(['skillName', 'outcome'])['score'].mean().unstack()
+
+    def skill_stats(self):
+        if self.sketches is not None:
+            return _shape_skill_stats(skill_score_stats(self.sketches))
+        return _shape_skill_stats(
+            self.scoring_df.groupby('skillName')['score'].agg(['mean', 'std', 'count', 'min', 'max'])
+        )
+
+    def skill_focus_stats(self, skill=DISCOVER_WHY):
+        scoring_df, merged_df = self.scoring_df, self.merged_df
+        outcome_means = {
+            'won_mean': merged_df[(merged_df['skillName'] == skill) & (merged_df['outcome'] == 'won')]['score'].mean(),
+            'lost_mean': merged_df[(merged_df['skillName'] == skill) & (merged_df['outcome'] == 'lost')]['score'].mean(),
+        }
+        if self.sketches is not None:
+            histogram = self.sketches.by_skill.get(skill, ScoreHistogram())
+            return {
+                'mean': histogram.mean(),
+                'std': histogram.std(),
+                **outcome_means,
+                'score_1_count': histogram.frequency(1),
+                'score_5_count': histogram.frequency(5),
+                'total': histogram.total + self.sketches.unscored_by_skill.get(skill, 0),
+            }
+        focus = scoring_df[scoring_df['skillName'] == skill]
+        return {
+            'mean': focus['score'].mean(),
+            'std': focus['score'].std(),
+            **outcome_means,
+            'score_1_count': (focus['score'] == 1).sum(),
+            'score_5_count': (focus['score'] == 5).sum(),
+            'total': len(focus)
+        }
+
+    def outcome_counts(self):
+        return self.recording_df['outcome'].value_counts()
+
+    def outcome_questions(self):
+        return self.recording_df.groupby('outcome').agg({
+            'repQuestionsCount': 'mean',
+            'customerQuestionsCount': 'mean'
+        })
+
+    def user_stats(self):
+        """Per-rep table for Slide 5, sorted by win rate"""
+        user_stats = self.recording_df.groupby('userId').agg({
+            'recordingid': 'count',
+            'outcome': lambda x: (x == 'won').sum(),
+            'duration_minutes': 'mean',
+            'repWordCount': 'mean',
+            'repQuestionsCount': 'mean',
+            'customerQuestionsCount': 'mean'
+        })
+        user_skill_scores = self.merged_df.groupby('userId_recording')['score'].mean()
+        return _shape_user_stats(user_stats, user_skill_scores)
+
+
+# ============================================================================
+# DUCKDB ENGINE
+# ============================================================================
+def _scan(path):
+    """DuckDB table function reading a CSV or Parquet file (or glob) lazily"""
+    escaped = path.replace("'", "''")
+    if path.endswith('.parquet'):
+        return f"read_parquet('{escaped}')"
+    return f"read_csv_auto('{escaped}')"
+
+
+class DuckDBEngine:
+    """Multi-threaded SQL over tables loaded once from frames or raw files
+
+    recording / scoring: DataFrames (e.g. validation.validate's output) or
+    CSV/Parquet paths and globs.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, recording, scoring, threads=None, memory_limit=None):
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("The duckdb engine needs the duckdb package: pip install duckdb") from None
+
+        self.con = duckdb.connect()
+        self._row_counts = None
+        self._registered = []
+        # Dates are bucketed the way pandas does it for naive or UTC timestamps
+        self.con.execute("SET TimeZone = 'UTC'")
+        if threads:
+            self.con.execute(f"SET threads = {int(threads)}")
+        if memory_limit:
+            self.con.execute(f"SET memory_limit = '{memory_limit}'")
+
+        # Same derived columns and coercions as analysis.load_data. Temp tables rather
+        # than views over read_csv_auto, so the ~15 queries per run don't each re-parse the files
+        self.con.execute(f"""
+            CREATE TEMP TABLE recordings AS
+            SELECT *,
+                   CAST(dateCreated AS TIMESTAMP) AS created_ts,
+                   CAST(CAST(dateCreated AS TIMESTAMP) AS DATE) AS created_date,
+                   durationInMilliseconds / 60000.0 AS duration_minutes
+            FROM {self._source('recording_input', recording)}
+        """)
+        self.con.execute(f"""
+            CREATE TEMP TABLE scores AS
+            SELECT * REPLACE (TRY_CAST(score AS DOUBLE) AS score),
+                   CAST(CAST(recordingdate AS TIMESTAMP) AS DATE) AS scored_date
+            FROM {self._source('scoring_input', scoring)}
+        """)
+        # The tables hold their own copy; drop the references to the frames
+        for name in self._registered:
+            self.con.unregister(name)
+        self.con.execute("""
+            CREATE VIEW merged AS
+            SELECT r.userId AS userId_recording, r.outcome, s.skillName, s.score, s.scored_date
+            FROM recordings r JOIN scores s USING (recordingid)
+        """)
+
+    def _source(self, name, source):
+        """FROM target for a frame (registered under name) or a file path"""
+        if isinstance(source, pd.DataFrame):
+            self.con.register(name, source)
+            self._registered.append(name)
+            return name
+        return _scan(os.fspath(source))
+
+    def _df(self, sql, params=None):
+        return self.con.execute(sql, params or []).df()
+
+    def _one(self, sql, params=None):
+        return self.con.execute(sql, params or []).fetchone()
+
+    def row_counts(self):
+        # The tables never change after __init__, so the join is counted once
+        if self._row_counts is None:
+            recordings, evaluations, merged = self._one("""
+                SELECT (SELECT count(*) FROM recordings),
+                       (SELECT count(*) FROM scores),
+                       (SELECT count(*) FROM merged)
+            """)
+            self._row_counts = {'recordings': recordings, 'evaluations': evaluations, 'merged': merged}
+        return self._row_counts
+
+    def headline(self):
+        params = [EARLY_PERIOD_END, LATE_PERIOD_START]
+        rec = self._one("""
+            SELECT count(*),
+                   count(DISTINCT userId),
+                   avg(CASE WHEN outcome = 'won' THEN 1.0 ELSE 0.0 END) * 100,
+                   avg(duration_minutes),
+                   min(created_date),
+                   max(created_date),
+                   avg(CASE WHEN outcome = 'won' THEN 1.0 ELSE 0.0 END)
+                       FILTER (WHERE created_date <= CAST(? AS DATE)) * 100,
+                   avg(CASE WHEN outcome = 'won' THEN 1.0 ELSE 0.0 END)
+                       FILTER (WHERE created_date >= CAST(? AS DATE)) * 100
+            FROM recordings
+        """, params)
+        evaluations, unique_skills, avg_skill_score = self._one(
+            "SELECT count(*), count(DISTINCT skillName), avg(score) FROM scores"
+        )
+        early_scores, late_scores = self._one("""
+            SELECT avg(score) FILTER (WHERE scored_date <= CAST(? AS DATE)),
+                   avg(score) FILTER (WHERE scored_date >= CAST(? AS DATE))
+            FROM merged
+        """, params)
+        return {
+            'total_recordings': rec[0],
+            'total_users': rec[1],
+            'total_evaluations': evaluations,
+            'unique_skills': unique_skills,
+            'overall_win_rate': rec[2],
+            'avg_duration': rec[3],
+            'avg_skill_score': avg_skill_score,
+            'first_date': rec[4],
+            'last_date': rec[5],
+            'first_week_win_rate': rec[6],
+            'last_week_win_rate': rec[7],
+            'early_scores': early_scores,
+            'late_scores': late_scores,
+        }
+
+    def weekly_win_rates(self):
+        return self._df("""
+            SELECT strftime(date_trunc('week', created_ts), '%Y-%m-%d') || '/' ||
+                   strftime(date_trunc('week', created_ts) + INTERVAL 6 DAY, '%Y-%m-%d') AS week_str,
+                   avg(CASE WHEN outcome = 'won' THEN 1.0 ELSE 0.0 END) * 100 AS win_rate
+            FROM recordings
+            WHERE created_ts IS NOT NULL
+            GROUP BY 1
+            ORDER BY 1
+        """)
+
+    def daily_win_rates(self):
+        daily = self._df("""
+            SELECT created_date AS date,
+                   avg(CASE WHEN outcome = 'won' THEN 1.0 ELSE 0.0 END) * 100 AS outcome
+            FROM recordings
+            WHERE created_date IS NOT NULL
+            GROUP BY 1
+            ORDER BY 1
+        """)
+        daily['date'] = pd.to_datetime(daily['date']).dt.date
+        return daily.set_index('date')['outcome']
+
+    def skill_outcome_scores(self):
+        return _shape_skill_outcome(self._df("""
+            SELECT skillName, outcome, avg(score) AS score
+            FROM merged
+            WHERE skillName IS NOT NULL AND outcome IS NOT NULL
+            GROUP BY 1, 2
+            ORDER BY 1, 2
+        """))
+
+    def skill_stats(self):
+        skill_stats = self._df("""
+            SELECT skillName,
+                   avg(score) AS mean,
+                   stddev_samp(score) AS std,
+                   count(score) AS count,
+                   min(score) AS min,
+                   max(score) AS max
+            FROM scores
+            WHERE skillName IS NOT NULL
+            GROUP BY 1
+            ORDER BY 1
+        """).set_index('skillName')
+        if self._scores_are_integers():
+            skill_stats[['min', 'max']] = skill_stats[['min', 'max']].astype('int64')
+        return _shape_skill_stats(skill_stats)
+
+    def _scores_are_integers(self):
+        """Mirror pd.to_numeric, which keeps an integer dtype when every score parses as one"""
+        return bool(self._one("""
+            SELECT count(score) = count(*) AND coalesce(bool_and(score = floor(score)), true)
+            FROM scores
+        """)[0])
+
+    def skill_focus_stats(self, skill=DISCOVER_WHY):
+        mean, std, score_1, score_5, total = self._one("""
+            SELECT avg(score), stddev_samp(score),
+                   count(*) FILTER (WHERE score = 1),
+                   count(*) FILTER (WHERE score = 5),
+                   count(*)
+            FROM scores
+            WHERE skillName = ?
+        """, [skill])
+        won_mean, lost_mean = self._one("""
+            SELECT avg(score) FILTER (WHERE outcome = 'won'),
+                   avg(score) FILTER (WHERE outcome = 'lost')
+            FROM merged
+            WHERE skillName = ?
+        """, [skill])
+        return {
+            'mean': mean,
+            'std': std,
+            'won_mean': won_mean,
+            'lost_mean': lost_mean,
+            'score_1_count': score_1,
+            'score_5_count': score_5,
+            'total': total
+        }
+
+    def outcome_counts(self):
+        counts = self._df("""
+            SELECT outcome, count(*) AS count
+            FROM recordings
+            WHERE outcome IS NOT NULL
+            GROUP BY 1
+            ORDER BY 2 DESC, 1
+        """)
+        return counts.set_index('outcome')['count']
+
+    def outcome_questions(self):
+        return self._df("""
+            SELECT outcome,
+                   avg(repQuestionsCount) AS repQuestionsCount,
+                   avg(customerQuestionsCount) AS customerQuestionsCount
+            FROM recordings
+            WHERE outcome IS NOT NULL
+            GROUP BY 1
+            ORDER BY 1
+        """).set_index('outcome')
+
+    def user_stats(self):
+        user_stats = self._df("""
+            SELECT userId,
+                   count(recordingid) AS num_recordings,
+                   count(*) FILTER (WHERE outcome = 'won') AS wins,
+                   avg(duration_minutes) AS avg_duration_min,
+                   avg(repWordCount) AS avg_words,
+                   avg(repQuestionsCount) AS avg_rep_questions,
+                   avg(customerQuestionsCount) AS avg_customer_questions
+            FROM recordings
+            WHERE userId IS NOT NULL
+            GROUP BY 1
+            ORDER BY 1
+        """).set_index('userId')
+        user_skill_scores = self._df("""
+            SELECT userId_recording, avg(score) AS score
+            FROM merged
+            WHERE userId_recording IS NOT NULL
+            GROUP BY 1
+        """).set_index('userId_recording')['score']
+        return _shape_user_stats(user_stats, user_skill_scores)
+
+
+ENGINES = {
+    'pandas': PandasEngine,
+    'duckdb': DuckDBEngine,
+}
@@ -6,23 +6,45 @@ This script uses OpenAI's API to extract deeper insights from text data:
 - Slide 3: Deep dive on "Discover the Why" skill (weakest skill)
 - Slide 6: Root cause analysis of performance decline over time
 
+Prompt examples are drawn with sampling.StratifiedReservoir (seeded,
+stratified by skill, outcome and score band, spread across reps and weeks);
+the (recordingid, skillName) pairs behind each prompt are saved with the
+results. SIRO_SAMPLE_SEED changes the seed. SIRO_RESERVOIR names a reservoir
+saved by `sampling.py build`, which is used instead of loading the CSVs.
+
 Requires OPENAI_API_KEY environment variable to be set.
 """
 
 import pandas as pd
-import numpy as np
+import importlib.util
 import json
 import os
-from openai import OpenAI
 import warnings
+from profiling import span
+from sampling import StratifiedReservoir, build_reservoir
+from validation import describe, validate
 warnings.filterwarnings('ignore')
 
-# Initialize OpenAI client
 # API key should be set as environment variable: OPENAI_API_KEY
+# Checked up front so a misconfigured job fails before loading any data
 api_key = os.getenv('OPENAI_API_KEY')
 if not api_key:
     raise ValueError("OPENAI_API_KEY environment variable not set. Please set it before running this script.")
-client = OpenAI(api_key=api_key)
+if importlib.util.find_spec('openai') is None:
+    raise ImportError("llm_analysis.py needs the openai package: pip install openai")
+client = None
+
+def get_client():
+    """Create the OpenAI client on first use (the openai package is slow to import)"""
+    global client
+    if client is None:
+        from openai import OpenAI
+        client = OpenAI(api_key=api_key)
+    return client
+
+# Seed for the prompt samples; the same seed and data give the same prompts
+SAMPLE_SEED = int(os.getenv('SIRO_SAMPLE_SEED', '0'))
+RESERVOIR_PATH = os.getenv('SIRO_RESERVOIR')
 
 # Cost tracking
 total_tokens_used = 0
@@ -42,9 +64,11 @@ def estimate_cost(prompt_tokens, completion_tokens, model="gpt-3.5-turbo"):
 def call_openai(prompt, model="gpt-3.5-turbo", max_tokens=1000, temperature=0.3):
     """Call OpenAI API with error handling and cost tracking"""
     global total_tokens_used, total_cost
-    
+
+    # Outside the try: a broken openai install should stop the run, not be reported as a failed call
+    openai_client = get_client()
     try:
-        response = client.chat.completions.create(
+        response = openai_client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
             max_tokens=max_tokens,
@@ -72,37 +96,62 @@ print()
 # ============================================================================
 # SECTION 1: LOAD AND PREPARE DATA
 # ============================================================================
-print("Loading data...")
-recording_df = pd.read_csv('ds_takehome_recording.csv')
-scoring_df = pd.read_csv('ds_takehome_scoring_metadata.csv')
+with span('load') as s:
+    print("Loading data...")
+    if RESERVOIR_PATH:
+        reservoir = StratifiedReservoir.load(RESERVOIR_PATH)
+        print(f"Using the reservoir saved in '{RESERVOIR_PATH}' (seed {reservoir.seed})")
+    else:
+        recording_df = pd.read_csv('ds_takehome_recording.csv')
+        scoring_df = pd.read_csv('ds_takehome_scoring_metadata.csv')
+        s.add_rows(len(recording_df) + len(scoring_df))
+        recording_df, scoring_df, _, quality = validate(recording_df, scoring_df)
+        print(describe(quality))
 
 # Parse JSON metadata to extract text fields
 def parse_metadata(row):
     """Extract impact and recommendation text from JSON metadata"""
     try:
         metadata = json.loads(row['scoringMetadata'])
+        # "impact": null parses to None; the prompts slice these as strings
         return {
-            'impact': metadata.get('impact', ''),
-            'recommendation': metadata.get('recommendation', ''),
+            'impact': metadata.get('impact') or '',
+            'recommendation': metadata.get('recommendation') or '',
         }
-    except:
+    except (TypeError, ValueError, AttributeError):
         return {
             'impact': '',
             'recommendation': '',
         }
 
-scoring_df['parsed_metadata'] = scoring_df.apply(parse_metadata, axis=1)
-scoring_df['impact_text'] = scoring_df['parsed_metadata'].apply(lambda x: x['impact'])
-scoring_df['recommendation_text'] = scoring_df['parsed_metadata'].apply(lambda x: x['recommendation'])
-
-# Merge with outcomes
-recording_df['dateCreated'] = pd.to_datetime(recording_df['dateCreated'])
-scoring_df['recordingdate'] = pd.to_datetime(scoring_df['recordingdate'])
-merged_df = recording_df.merge(scoring_df, on='recordingid', how='inner', suffixes=('_recording', '_scoring'))
-merged_df['score'] = pd.to_numeric(merged_df['score'], errors='coerce')
-
-print(f"Loaded {len(merged_df)} merged records")
-print()
+def with_text(sample):
+    """Parse metadata (for the reservoir rows only), adding impact_text and recommendation_text"""
+    parsed = sample.apply(parse_metadata, axis=1)
+    sample['impact_text'] = parsed.apply(lambda x: x['impact'])
+    sample['recommendation_text'] = parsed.apply(lambda x: x['recommendation'])
+    return sample
+
+def sample_keys(sample):
+    """(recordingid, skillName) pairs of the rows behind a prompt"""
+    return sample[['recordingid', 'skillName']].values.tolist()
+
+with span('prepare') as s:
+    # Seeded, stratified reservoir (skill x outcome x score band) that every prompt samples from;
+    # only recordingid -> outcome is taken from the recordings, no full merge
+    if not RESERVOIR_PATH:
+        reservoir = build_reservoir(recording_df, scoring_df, seed=SAMPLE_SEED)
+        s.add_rows(len(scoring_df))
+    prompt_samples = {'seed': reservoir.seed}
+    # The reservoir is small, so its metadata is parsed once up front
+    reservoir.rows = with_text(reservoir.rows)
+
+    def quotable(condition):
+        """condition, restricted to rows with an impact or a recommendation to put in a prompt"""
+        return lambda rows: condition(rows) & ((rows['impact_text'] != '') | (rows['recommendation_text'] != ''))
+
+    print(f"Sampling from {len(reservoir.rows)} of {reservoir.seen} evaluations "
+          f"across {reservoir.stratum_count()} strata (seed {reservoir.seed})")
+    print()
 
 # ============================================================================
 # SECTION 2: SLIDE 3 - "DISCOVER THE WHY" DEEP DIVE
@@ -112,14 +161,22 @@ print("SLIDE 3: 'DISCOVER THE WHY' DEEP DIVE")
 print("=" * 80)
 
 # Focus on the weakest skill
-discover_why = merged_df[merged_df['skillName'] == 'Discover the "Why"'].copy()
-discover_why_high = discover_why[discover_why['score'] >= 4]
-discover_why_low = discover_why[discover_why['score'] <= 2]
-
-# Extract sample impacts and recommendations
-high_impacts = discover_why_high['impact_text'].dropna().tolist()[:15]
-low_impacts = discover_why_low['impact_text'].dropna().tolist()[:15]
-high_recs = discover_why_high['recommendation_text'].dropna().tolist()[:15]
+with span('slide3_sampling') as s:
+    def discover_why_band(band):
+        return lambda rows: (rows['skillName'] == 'Discover the "Why"') & (rows['score_band'] == band)
+
+    discover_why_high = reservoir.sample(10, quotable(discover_why_band('high')))
+    discover_why_low = reservoir.sample(10, quotable(discover_why_band('low')))
+
+    # Extract sample impacts and recommendations (a row may have only one of the two)
+    high_impacts = [text for text in discover_why_high['impact_text'] if text]
+    low_impacts = [text for text in discover_why_low['impact_text'] if text]
+    high_recs = [text for text in discover_why_high['recommendation_text'] if text]
+    prompt_samples['discover_why_analysis'] = {
+        'high_score': sample_keys(discover_why_high),
+        'low_score': sample_keys(discover_why_low),
+    }
+    s.add_rows(len(reservoir.rows))
 
 # Create prompt for LLM analysis
 prompt1 = f"""The skill "Discover the Why" has the lowest average score (2.63/5.0) across all reps.
@@ -141,10 +198,11 @@ Based on this analysis, provide:
 
 Be specific and practical."""
 
-print("Analyzing 'Discover the Why' skill...")
-result1, tokens1, cost1 = call_openai(prompt1, model="gpt-3.5-turbo", max_tokens=1000)
-print(result1)
-print(f"\nTokens used: {tokens1}, Estimated cost: ${cost1:.4f}\n")
+with span('slide3_llm_call'):
+    print("Analyzing 'Discover the Why' skill...")
+    result1, tokens1, cost1 = call_openai(prompt1, model="gpt-3.5-turbo", max_tokens=1000)
+    print(result1)
+    print(f"\nTokens used: {tokens1}, Estimated cost: ${cost1:.4f}\n")
 
 # ============================================================================
 # SECTION 3: SLIDE 6 - TEMPORAL DECLINE ROOT CAUSE ANALYSIS
@@ -154,14 +212,23 @@ print("SLIDE 6: TEMPORAL DECLINE ROOT CAUSE ANALYSIS")
 print("=" * 80)
 
 # Compare early vs late period recommendations
-merged_df['date'] = merged_df['recordingdate'].dt.date
-early_period = merged_df[merged_df['date'] <= pd.to_datetime('2025-08-15').date()]
-late_period = merged_df[merged_df['date'] >= pd.to_datetime('2025-09-15').date()]
-
-early_recs = early_period['recommendation_text'].dropna().tolist()[:20]
-late_recs = late_period['recommendation_text'].dropna().tolist()[:20]
-early_impacts = early_period['impact_text'].dropna().tolist()[:15]
-late_impacts = late_period['impact_text'].dropna().tolist()[:15]
+with span('slide6_sampling') as s:
+    def recorded(condition):
+        # The reservoir's day labels: calendar days in the timestamps' own time zone, as on the slides
+        return quotable(lambda rows: condition(pd.to_datetime(rows['day'])))
+
+    early_period = reservoir.sample(15, recorded(lambda d: d <= pd.Timestamp('2025-08-15')))
+    late_period = reservoir.sample(15, recorded(lambda d: d >= pd.Timestamp('2025-09-15')))
+
+    early_recs = [text for text in early_period['recommendation_text'] if text]
+    late_recs = [text for text in late_period['recommendation_text'] if text]
+    early_impacts = [text for text in early_period['impact_text'] if text][:10]
+    late_impacts = [text for text in late_period['impact_text'] if text][:10]
+    prompt_samples['temporal_decline'] = {
+        'early_period': sample_keys(early_period),
+        'late_period': sample_keys(late_period),
+    }
+    s.add_rows(len(reservoir.rows))
 
 # Create prompt for LLM analysis
 prompt2 = f"""Performance declined significantly: win rate dropped from 64% to 40% and skill scores declined 15% over time.
@@ -186,10 +253,11 @@ Analyze what changed and provide:
 
 Focus on actionable insights."""
 
-print("Analyzing temporal decline...")
-result2, tokens2, cost2 = call_openai(prompt2, model="gpt-3.5-turbo", max_tokens=1000)
-print(result2)
-print(f"\nTokens used: {tokens2}, Estimated cost: ${cost2:.4f}\n")
+with span('slide6_llm_call'):
+    print("Analyzing temporal decline...")
+    result2, tokens2, cost2 = call_openai(prompt2, model="gpt-3.5-turbo", max_tokens=1000)
+    print(result2)
+    print(f"\nTokens used: {tokens2}, Estimated cost: ${cost2:.4f}\n")
 
 # ============================================================================
 # SECTION 4: SAVE RESULTS
@@ -205,6 +273,8 @@ print(f"Remaining budget: ${100 - total_cost:.2f}")
 results = {
     "discover_why_analysis": result1,
     "temporal_decline": result2,
+    # (recordingid, skillName) pairs behind each prompt, so a run can be reproduced or audited
+    "prompt_samples": prompt_samples,
     "cost_summary": {
         "total_tokens": total_tokens_used,
         "total_cost": total_cost,
@@ -0,0 +1,287 @@
+"""
+Lightweight stage instrumentation for the analysis scripts
+Times each section of a run and writes a machine-readable report
+
+Wrap a section of work in a span:
+
+    from profiling import span
+
+    with span('slide2_skill_scores') as s:
+        ...
+        s.add_rows(len(merged_df))
+
+Profiling is off unless SIRO_PROFILE is set to an output path prefix:
+
+    SIRO_PROFILE=profile python analysis.py
+
+which writes at exit:
+- profile_report.json: per-stage wall time, CPU time, RSS change, rows
+  processed, and the process peak RSS so far
+- profile_trace.json: Chrome trace format (chrome://tracing or ui.perfetto.dev)
+
+Optional extras (only read when SIRO_PROFILE is set):
+- SIRO_PROFILE_STAGES=cprofile|pyinstrument: per-stage profiler capture,
+  written as <prefix>_<stage>.prof (pstats) or <prefix>_<stage>.html
+- SIRO_PROFILE_TRACEMALLOC=1: peak Python heap per stage (slows the run)
+
+When profiling is disabled span() returns a shared no-op object, so the
+instrumentation costs one function call per stage.
+"""
+
+import atexit
+import json
+import os
+import re
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class _NullSpan:
+    """No-op span used when profiling is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def add_rows(self, n):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _peak_rss_mb():
+    """Peak resident set size over the process lifetime in MB (None if unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def _current_rss_mb():
+    """Current resident set size in MB from /proc (None off Linux)"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+class _Span:
+    """A timed stage; records itself on the profiler when it exits"""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.rows = 0
+        self.child_heap_peak = 0
+        self.stage_profiler = None
+
+    def add_rows(self, n):
+        self.rows += int(n)
+
+    def __enter__(self):
+        profiler = self.profiler
+        self.parent = profiler.stack[-1] if profiler.stack else None
+        profiler.stack.append(self)
+
+        if profiler.trace_memory:
+            import tracemalloc
+            tracemalloc.reset_peak()
+
+        # Only one stage profiler can be active at a time, so nested spans
+        # are covered by their outermost captured parent
+        if profiler.stage_mode and not profiler.capturing:
+            self.stage_profiler = profiler.start_stage_profiler()
+
+        self.start_rss = _current_rss_mb()
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.process_time() - self.start_cpu
+        profiler = self.profiler
+
+        if self.stage_profiler is not None:
+            profiler.stop_stage_profiler(self.stage_profiler, self.name)
+
+        record = {
+            'name': self.name,
+            'depth': len(profiler.stack) - 1,
+            'start_s': self.start_wall - profiler.origin,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'rows': self.rows,
+            # ru_maxrss is a process-lifetime high-water mark, so it is labelled as
+            # such; the per-stage number is the change in current RSS
+            'rss_delta_mb': None if self.start_rss is None else _current_rss_mb() - self.start_rss,
+            'process_peak_rss_mb': _peak_rss_mb(),
+            'error': exc_type.__name__ if exc_type is not None else None,
+        }
+
+        if profiler.trace_memory:
+            import tracemalloc
+            # reset_peak() in a child clears the parent's peak, so children
+            # hand their peak up the stack
+            heap_peak = max(tracemalloc.get_traced_memory()[1], self.child_heap_peak)
+            record['peak_heap_mb'] = heap_peak / (1024 * 1024)
+            if self.parent is not None:
+                self.parent.child_heap_peak = max(self.parent.child_heap_peak, heap_peak)
+
+        profiler.stack.pop()
+        profiler.records.append(record)
+        return False
+
+
+class Profiler:
+    """Collects stage records and writes the JSON and Chrome trace reports"""
+
+    def __init__(self, prefix, stage_mode=None, trace_memory=False):
+        self.prefix = prefix
+        self.stage_mode = stage_mode
+        self.trace_memory = trace_memory
+        self.records = []
+        self.stack = []
+        self.capturing = False
+        self.origin = time.perf_counter()
+        self.origin_cpu = time.process_time()
+        self.written = False
+
+        if stage_mode not in (None, 'cprofile', 'pyinstrument'):
+            raise ValueError(f"Unknown SIRO_PROFILE_STAGES mode: {stage_mode!r}")
+        if trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+
+    def start_stage_profiler(self):
+        if self.stage_mode == 'cprofile':
+            import cProfile
+            stage_profiler = cProfile.Profile()
+            stage_profiler.enable()
+        else:
+            from pyinstrument import Profiler as PyinstrumentProfiler
+            stage_profiler = PyinstrumentProfiler()
+            stage_profiler.start()
+        self.capturing = True
+        return stage_profiler
+
+    def stop_stage_profiler(self, stage_profiler, name):
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+        if self.stage_mode == 'cprofile':
+            stage_profiler.disable()
+            stage_profiler.dump_stats(f"{self.prefix}_{slug}.prof")
+        else:
+            stage_profiler.stop()
+            with open(f"{self.prefix}_{slug}.html", 'w') as f:
+                f.write(stage_profiler.output_html())
+        self.capturing = False
+
+    def report(self):
+        """Summary of the run so far as a JSON-serialisable dict"""
+        return {
+            'script': os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else None,
+            'total_wall_s': time.perf_counter() - self.origin,
+            'total_cpu_s': time.process_time() - self.origin_cpu,
+            'process_peak_rss_mb': _peak_rss_mb(),
+            'stages': sorted(self.records, key=lambda r: r['start_s']),
+        }
+
+    def chrome_trace(self):
+        """Stage records as Chrome trace 'complete' events (microseconds)"""
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            args = {k: v for k, v in record.items() if k not in ('name', 'start_s', 'wall_s')}
+            events.append({
+                'name': record['name'],
+                'cat': 'stage',
+                'ph': 'X',
+                'ts': record['start_s'] * 1e6,
+                'dur': record['wall_s'] * 1e6,
+                'pid': pid,
+                'tid': 0,
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self):
+        """Write <prefix>_report.json and <prefix>_trace.json"""
+        with open(f"{self.prefix}_report.json", 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        with open(f"{self.prefix}_trace.json", 'w') as f:
+            json.dump(self.chrome_trace(), f)
+        self.written = True
+        print(f"\nProfile written to '{self.prefix}_report.json' and '{self.prefix}_trace.json'")
+
+
+_profiler = None
+# SIRO_PROFILE's prefix; restart() suffixes this, not the previous worker task's prefix
+_base_prefix = None
+_atexit_registered = False
+
+
+def _start(prefix, stage_mode, trace_memory):
+    global _profiler, _atexit_registered
+    _profiler = Profiler(prefix, stage_mode=stage_mode, trace_memory=trace_memory)
+    if not _atexit_registered:
+        atexit.register(_write_at_exit)
+        _atexit_registered = True
+    return _profiler
+
+
+def enable(prefix, stage_mode=None, trace_memory=False):
+    """Turn on profiling for this process; the report is written at exit"""
+    global _base_prefix
+    _base_prefix = prefix
+    return _start(prefix, stage_mode, trace_memory)
+
+
+def restart(suffix):
+    """Start a fresh profiler writing to <prefix>_<suffix>, keeping the current settings
+
+    For worker processes, which would otherwise share (and overwrite) the
+    parent's output files. <prefix> is the one given to enable(), however many
+    times restart() has been called. Returns the new profiler, or None when disabled.
+    """
+    if _profiler is None:
+        return None
+    slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', str(suffix))
+    return _start(f"{_base_prefix}_{slug}", _profiler.stage_mode, _profiler.trace_memory)
+
+
+def is_enabled():
+    return _profiler is not None
+
+
+def span(name):
+    """Context manager timing one stage; a shared no-op when disabled"""
+    if _profiler is None:
+        return _NULL_SPAN
+    return _Span(_profiler, name)
+
+
+def _write_at_exit():
+    if _profiler is not None and not _profiler.written:
+        _profiler.write()
+
+
+if os.getenv('SIRO_PROFILE'):
+    enable(
+        os.getenv('SIRO_PROFILE'),
+        stage_mode=os.getenv('SIRO_PROFILE_STAGES') or None,
+        trace_memory=os.getenv('SIRO_PROFILE_TRACEMALLOC', '') not in ('', '0'),
+    )
@@ -0,0 +1,290 @@
+"""
+Rep Analytics Query Service
+Serves the Slide 5 per-rep table for any date range over local HTTP/JSON
+
+Recordings and skill evaluations are rolled up once into dense cubes:
+- recordings: (user, day, outcome) -> count and per-metric sums/counts
+- scores:     (user, day, skill, outcome) -> evaluation count and score sum
+Each cube is stored as a prefix sum over the day axis, so a date range query
+is two slices and a subtraction per cube, independent of how many recordings
+or evaluations were loaded.
+
+Endpoints:
+    GET /health
+    GET /reps?start=2025-08-06&end=2025-08-15       per-rep table (Slide 5)
+    GET /reps/<userId>?start=...&end=...            one rep plus per-skill scores
+
+Usage:
+    python rep_service.py                           # build from the CSVs, serve on :8050
+    python rep_service.py --save-rollups rollups.npz
+    python rep_service.py --rollups rollups.npz     # skip the CSV scan on startup
+    python rep_service.py --rollups rollups.npz --benchmark 2000
+"""
+
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import numpy as np
+from profiling import span
+
+# Recording metrics averaged per rep, as in analysis.slide5_rep_variation
+RECORDING_METRICS = [
+    ('duration_minutes', 'avg_duration_min'),
+    ('repWordCount', 'avg_words'),
+    ('repQuestionsCount', 'avg_rep_questions'),
+    ('customerQuestionsCount', 'avg_customer_questions'),
+]
+
+
+def _prefix_over_days(cube):
+    """Cumulative sum along axis 1 (days) with a leading zero slice"""
+    shape = list(cube.shape)
+    shape[1] += 1
+    prefix = np.zeros(shape, dtype=np.float64)
+    np.cumsum(cube, axis=1, out=prefix[:, 1:])
+    return prefix
+
+
+class RepRollups:
+    """Prefix-summed rollup cubes answering per-rep date range queries"""
+
+    def __init__(self, users, skills, outcomes, first_day, recording_prefix, score_prefix):
+        self.users = list(users)
+        self.skills = list(skills)
+        self.outcomes = list(outcomes)
+        self.first_day = np.datetime64(first_day, 'D')
+        self.recording_prefix = recording_prefix  # (U, D+1, O, 1 + 2*len(RECORDING_METRICS))
+        self.score_prefix = score_prefix          # (U, D+1, S, O, 2)
+        self.num_days = recording_prefix.shape[1] - 1
+        self.user_index = {user: i for i, user in enumerate(self.users)}
+
+    @classmethod
+    def build(cls, recording_df, merged_df):
+        """Roll up loaded frames (see analysis.load_data) into prefix-summed cubes"""
+        with span('build_rollups') as s:
+            users = sorted(recording_df['userId'].unique())
+            outcomes = sorted(recording_df['outcome'].dropna().unique())
+            skills = sorted(merged_df['skillName'].dropna().unique())
+            user_codes = {u: i for i, u in enumerate(users)}
+            outcome_codes = {o: i for i, o in enumerate(outcomes)}
+            skill_codes = {k: i for i, k in enumerate(skills)}
+
+            rec_days = recording_df['dateCreated'].values.astype('datetime64[D]')
+            first_day = rec_days.min()
+            num_days = int((rec_days.max() - first_day).astype(int)) + 1
+            U, D, O, S = len(users), num_days, len(outcomes), len(skills)
+
+            # Recording cube: count plus a sum and non-null count per metric
+            rec = recording_df[recording_df['outcome'].notna()]
+            u = rec['userId'].map(user_codes).to_numpy()
+            d = (rec['dateCreated'].values.astype('datetime64[D]') - first_day).astype(np.int64)
+            o = rec['outcome'].map(outcome_codes).to_numpy()
+            flat = (u * D + d) * O + o
+            size = U * D * O
+            measures = [np.bincount(flat, minlength=size)]
+            for column, _ in RECORDING_METRICS:
+                values = rec[column].to_numpy(dtype=np.float64)
+                present = ~np.isnan(values)
+                measures.append(np.bincount(flat[present], weights=values[present], minlength=size))
+                measures.append(np.bincount(flat[present], minlength=size))
+            recording_cube = np.stack(measures, axis=-1).reshape(U, D, O, len(measures))
+
+            # Score cube: keyed by the recording's rep, day and outcome
+            scored = merged_df[merged_df['score'].notna() & merged_df['outcome'].notna()
+                               & merged_df['skillName'].notna()]
+            u = scored['userId_recording'].map(user_codes).to_numpy()
+            d = (scored['dateCreated'].values.astype('datetime64[D]') - first_day).astype(np.int64)
+            k = scored['skillName'].map(skill_codes).to_numpy()
+            o = scored['outcome'].map(outcome_codes).to_numpy()
+            flat = ((u * D + d) * S + k) * O + o
+            size = U * D * S * O
+            score_cube = np.stack([
+                np.bincount(flat, minlength=size),
+                np.bincount(flat, weights=scored['score'].to_numpy(dtype=np.float64), minlength=size),
+            ], axis=-1).reshape(U, D, S, O, 2)
+
+            s.add_rows(len(recording_df) + len(merged_df))
+            return cls(users, skills, outcomes, first_day,
+                       _prefix_over_days(recording_cube), _prefix_over_days(score_cube))
+
+    def save(self, path):
+        np.savez(
+            path,
+            users=np.array(self.users, dtype=str),
+            skills=np.array(self.skills, dtype=str),
+            outcomes=np.array(self.outcomes, dtype=str),
+            first_day=np.array(self.first_day),
+            recording_prefix=self.recording_prefix,
+            score_prefix=self.score_prefix,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['users'].tolist(), data['skills'].tolist(), data['outcomes'].tolist(),
+                       data['first_day'][()], data['recording_prefix'], data['score_prefix'])
+
+    def _day_bounds(self, start=None, end=None):
+        """Map an inclusive [start, end] date range onto prefix indices"""
+        lo = 0 if start is None else int((np.datetime64(start, 'D') - self.first_day).astype(int))
+        hi = self.num_days if end is None else int((np.datetime64(end, 'D') - self.first_day).astype(int)) + 1
+        lo = min(max(lo, 0), self.num_days)
+        hi = min(max(hi, lo), self.num_days)
+        return lo, hi
+
+    def _rep_rows(self, recording_totals, score_totals, user_ids):
+        """Format (U', O, M) and (U', S, O, 2) range totals like the Slide 5 table"""
+        won = self.outcomes.index('won') if 'won' in self.outcomes else None
+        rows = []
+        for i, user_id in enumerate(user_ids):
+            totals = recording_totals[i].sum(axis=0)
+            num_recordings = int(totals[0])
+            if num_recordings == 0:
+                continue
+            wins = int(recording_totals[i, won, 0]) if won is not None else 0
+            row = {'userId': user_id, 'num_recordings': num_recordings, 'wins': wins}
+            for m, (_, name) in enumerate(RECORDING_METRICS):
+                metric_sum, metric_count = totals[1 + 2 * m], totals[2 + 2 * m]
+                row[name] = round(metric_sum / metric_count, 2) if metric_count else None
+            row['win_rate'] = round(wins / num_recordings * 100, 2)
+            score_count, score_sum = score_totals[i].sum(axis=(0, 1))
+            row['avg_skill_score'] = round(score_sum / score_count, 2) if score_count else None
+            rows.append(row)
+        return rows
+
+    def rep_table(self, start=None, end=None):
+        """Per-rep stats for the date range, sorted by win rate (Slide 5)"""
+        lo, hi = self._day_bounds(start, end)
+        recording_totals = self.recording_prefix[:, hi] - self.recording_prefix[:, lo]
+        score_totals = self.score_prefix[:, hi] - self.score_prefix[:, lo]
+        rows = self._rep_rows(recording_totals, score_totals, self.users)
+        return sorted(rows, key=lambda row: row['win_rate'], reverse=True)
+
+    def rep_detail(self, user_id, start=None, end=None):
+        """One rep's stats plus average score per skill and outcome; None if unknown"""
+        i = self.user_index.get(user_id)
+        if i is None:
+            return None
+        lo, hi = self._day_bounds(start, end)
+        recording_totals = self.recording_prefix[i:i + 1, hi] - self.recording_prefix[i:i + 1, lo]
+        score_totals = self.score_prefix[i:i + 1, hi] - self.score_prefix[i:i + 1, lo]
+        rows = self._rep_rows(recording_totals, score_totals, [user_id])
+        detail = rows[0] if rows else {'userId': user_id, 'num_recordings': 0}
+
+        skills = {}
+        for k, skill in enumerate(self.skills):
+            count, total = score_totals[0, k].sum(axis=0)
+            if not count:
+                continue
+            by_outcome = {}
+            for o, outcome in enumerate(self.outcomes):
+                outcome_count, outcome_sum = score_totals[0, k, o]
+                if outcome_count:
+                    by_outcome[outcome] = round(outcome_sum / outcome_count, 2)
+            skills[skill] = {'evaluations': int(count), 'avg_score': round(total / count, 2), 'by_outcome': by_outcome}
+        detail['skills'] = skills
+        return detail
+
+
+def make_handler(rollups):
+    """Request handler class bound to a RepRollups instance"""
+
+    class RepQueryHandler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            start, end = query.get('start'), query.get('end')
+            parts = [unquote(part) for part in url.path.strip('/').split('/') if part]
+
+            try:
+                if parts == ['health']:
+                    self._send(200, {'status': 'ok', 'reps': len(rollups.users), 'days': rollups.num_days})
+                elif parts == ['reps']:
+                    self._send(200, {'start': start, 'end': end, 'reps': rollups.rep_table(start, end)})
+                elif len(parts) == 2 and parts[0] == 'reps':
+                    detail = rollups.rep_detail(parts[1], start, end)
+                    if detail is None:
+                        self._send(404, {'error': f"unknown rep: {parts[1]}"})
+                    else:
+                        self._send(200, {'start': start, 'end': end, 'rep': detail})
+                else:
+                    self._send(404, {'error': f"no route for {url.path}"})
+            except ValueError as e:
+                # np.datetime64 raises ValueError on malformed dates
+                self._send(400, {'error': str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return RepQueryHandler
+
+
+def benchmark(rollups, num_queries=1000, seed=0):
+    """Time random date range queries against the rollups and print latency percentiles"""
+    rng = np.random.default_rng(seed)
+    latencies = []
+    for _ in range(num_queries):
+        lo, hi = sorted(rng.integers(0, rollups.num_days, size=2))
+        start = str(rollups.first_day + lo)
+        end = str(rollups.first_day + hi)
+        t0 = time.perf_counter()
+        if rng.random() < 0.5:
+            rollups.rep_table(start, end)
+        else:
+            rollups.rep_detail(rollups.users[rng.integers(len(rollups.users))], start, end)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"{num_queries} range queries: p50={p50:.3f} ms, p99={p99:.3f} ms")
+    return p50, p99
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve per-rep analytics over HTTP/JSON from precomputed rollups")
+    parser.add_argument('--recording', default='ds_takehome_recording.csv')
+    parser.add_argument('--scoring', default='ds_takehome_scoring_metadata.csv')
+    parser.add_argument('--rollups', help="load prebuilt rollups (.npz) instead of scanning the CSVs")
+    parser.add_argument('--save-rollups', help="write the built rollups to this .npz path")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--benchmark', type=int, metavar='N', help="time N random range queries and exit")
+    args = parser.parse_args(argv)
+
+    if args.rollups:
+        rollups = RepRollups.load(args.rollups)
+    else:
+        from analysis import load_data
+        recording_df, _, merged_df = load_data(args.recording, args.scoring)
+        rollups = RepRollups.build(recording_df, merged_df)
+    print(f"Rollups ready: {len(rollups.users)} reps, {len(rollups.skills)} skills, {rollups.num_days} days")
+
+    if args.save_rollups:
+        rollups.save(args.save_rollups)
+        print(f"Rollups saved to '{args.save_rollups}'")
+
+    if args.benchmark:
+        benchmark(rollups, args.benchmark)
+        return
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(rollups))
+    print(f"Serving rep analytics on http://{args.host}:{args.port}/reps")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""
+Deterministic Stratified Sampling for LLM Prompts
+Seeded, stratified reservoir samples of skill evaluations in one streaming pass
+
+The LLM prompts used to take the first rows of a filtered frame, so which
+evaluations reached the model depended on CSV row order and favoured the
+reps that happened to come first. StratifiedReservoir instead keeps a
+reservoir per stratum:
+
+    skill x outcome x score band
+
+Each evaluation gets a priority from a seeded hash of (recordingid,
+skillName), and a stratum keeps the per_stratum rows with the lowest
+priorities (bottom-k reservoir sampling). The result is:
+- deterministic for a given seed, whatever the row order or chunk size
+- one pass with only a chunk plus at most strata x per_stratum rows in memory
+- mergeable, so reservoirs built per file or per worker combine exactly
+
+Rep and week are not strata (the full product kept most of a large dataset);
+they are spread keys instead. sample() draws round-robin over stratum x rep x
+week cells, one row from each eligible cell (in priority order) before any
+cell gives a second, and the caller records the (recordingid, skillName)
+pairs it used in each prompt.
+
+Usage:
+    python sampling.py build --output reservoir.json [--per-stratum 50] [--seed 0] [--no-validate]
+    python sampling.py sample reservoir.json --skill 'Discover the "Why"' --band high -n 10
+"""
+
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+from profiling import span
+from sketches import calendar_days
+from validation import describe, validate
+
+RECORDING_CSV = 'ds_takehome_recording.csv'
+SCORING_CSV = 'ds_takehome_scoring_metadata.csv'
+
+STRATA = ['skillName', 'outcome', 'score_band']
+# Round-robin keys at sample time, so a sample spreads across reps and weeks
+SPREAD = ['userId', 'week']
+DEFAULT_PER_STRATUM = 50
+# Same cut-offs as the Slide 3 prompt: <= 2 is low, >= 4 is high
+SCORE_BANDS = [('low', -np.inf, 2), ('mid', 2, 3), ('high', 3, np.inf)]
+DEFAULT_SEED = 0
+
+
+def score_band(scores):
+    """Band label per score; unparseable or missing scores are 'unscored'"""
+    scores = pd.to_numeric(scores, errors='coerce').to_numpy(dtype=float)
+    conditions = [(scores > low) & (scores <= high) for _, low, high in SCORE_BANDS]
+    return np.select(conditions, [name for name, _, _ in SCORE_BANDS], default='unscored').astype(object)
+
+
+def week_start(dates):
+    """Monday of each date's week (datetime64[D]), with days bucketed as in sketches.calendar_days"""
+    return _monday(calendar_days(pd.Series(dates)))
+
+
+def _monday(days):
+    # Day 0 (1970-01-01) was a Thursday, three days after a Monday
+    return days - (days.view('int64') + 3) % 7
+
+
+def _combined_hash(columns, hash_key=None):
+    """uint64 hash per row over several arrays (a cheaper hash_pandas_object)"""
+    combined = np.zeros(len(columns[0]), dtype=np.uint64)
+    for values in columns:
+        kwargs = {'hash_key': hash_key} if hash_key else {}
+        combined = combined * np.uint64(1_000_003) ^ pd.util.hash_array(np.asarray(values), **kwargs)
+    return combined
+
+
+def _splitmix64(values):
+    """splitmix64 finalizer: every output bit depends on every input bit"""
+    with np.errstate(over='ignore'):
+        values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def priorities(frame, seed):
+    """Uniform [0, 1) priority per (recordingid, skillName), fixed for a given seed
+
+    The finalizer matters: without it the priority is dominated by one column,
+    and the skills of a recording get near-identical ranks.
+    """
+    hash_key = format(seed % 10**16, '016d')
+    hashes = _splitmix64(pd.util.hash_pandas_object(frame[['recordingid', 'skillName']], index=False,
+                                                    hash_key=hash_key).to_numpy())
+    # Top 53 bits so the priority is exact as a float (and survives JSON)
+    return (hashes >> np.uint64(11)).astype(float) / 2.0**53
+
+
+class StratifiedReservoir:
+    """Bottom-k reservoir per stratum over skill evaluations"""
+
+    def __init__(self, per_stratum=DEFAULT_PER_STRATUM, seed=DEFAULT_SEED, strata=STRATA, spread=SPREAD):
+        self.per_stratum = per_stratum
+        self.seed = seed
+        self.strata = list(strata)
+        self.spread = list(spread)
+        self.rows = None
+        self.seen = 0
+
+    def update(self, chunk):
+        """Add a chunk with recordingid, skillName, userId, outcome, score and recordingdate columns"""
+        self.seen += len(chunk)
+        # Work on plain arrays and only build columns for the rows that survive the chunk's own bottom-k
+        days = calendar_days(chunk['recordingdate'])
+        derived = {'score_band': score_band(chunk['score']), 'week': _monday(days)}
+        priority = priorities(chunk, self.seed)
+        # One integer key per stratum; grouping on it is much cheaper than on the string columns
+        stratum = _combined_hash([derived[c] if c in derived else chunk[c].to_numpy(dtype=object)
+                                  for c in self.strata]).view('int64')
+        keep = self._bottom_k(priority, stratum)
+
+        kept = chunk.iloc[keep].reset_index(drop=True)
+        kept['score_band'] = derived['score_band'][keep]
+        kept['week'] = np.datetime_as_string(derived['week'][keep], unit='D')
+        # Day labels, so date filters on a saved reservoir don't depend on how timestamps round-trip JSON
+        kept['day'] = np.datetime_as_string(days[keep], unit='D')
+        kept['priority'] = priority[keep]
+        kept['stratum'] = stratum[keep]
+        self._absorb(kept)
+
+    def _bottom_k(self, priority, stratum):
+        """Positions of the per_stratum lowest-priority rows of each stratum, in priority order"""
+        order = np.argsort(priority, kind='stable')
+        # Equal priority means the same (recordingid, skillName): an evaluation seen twice is kept once
+        ordered = priority[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = ordered[1:] != ordered[:-1]
+        order = order[first]
+        strata = pd.Series(stratum[order])
+        return order[(strata.groupby(strata, sort=False).cumcount() < self.per_stratum).to_numpy()]
+
+    def _absorb(self, rows):
+        if self.rows is not None:
+            rows = pd.concat([self.rows, rows], ignore_index=True)
+            rows = rows.iloc[self._bottom_k(rows['priority'].to_numpy(), rows['stratum'].to_numpy())]
+        self.rows = rows.reset_index(drop=True)
+
+    def merge(self, other):
+        if (other.seed, other.per_stratum, other.strata) != (self.seed, self.per_stratum, self.strata):
+            raise ValueError("Can only merge reservoirs built with the same seed, per_stratum and strata")
+        self.seen += other.seen
+        if other.rows is not None:
+            self._absorb(other.rows)
+        return self
+
+    def sample(self, n, where=None):
+        """Up to n rows, spread round-robin across stratum x rep x week cells
+
+        where: optional function taking the reservoir rows and returning a
+        boolean mask of eligible rows (e.g. one skill and score band).
+        """
+        if self.rows is None:
+            return pd.DataFrame()
+        rows = self.rows if where is None else self.rows[where(self.rows)]
+        rank = rows.groupby(['stratum'] + self.spread, sort=False).cumcount()
+        order = np.lexsort((rows['priority'].to_numpy(), rank.to_numpy()))
+        return rows.iloc[order[:n]].reset_index(drop=True)
+
+    def stratum_count(self):
+        return 0 if self.rows is None else self.rows['stratum'].nunique()
+
+    def to_dict(self):
+        return {
+            'per_stratum': self.per_stratum,
+            'seed': self.seed,
+            'strata': self.strata,
+            'spread': self.spread,
+            'seen': self.seen,
+            'rows': [] if self.rows is None else json.loads(self.rows.to_json(orient='records', date_format='iso')),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        reservoir = cls(data['per_stratum'], data['seed'], data['strata'], data.get('spread', SPREAD))
+        reservoir.seen = data['seen']
+        reservoir.rows = pd.DataFrame(data['rows']) if data['rows'] else None
+        return reservoir
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def _chunks(frame, chunksize):
+    for start in range(0, len(frame), chunksize):
+        yield frame.iloc[start:start + chunksize].copy()
+
+
+def build_reservoir(recording=RECORDING_CSV, scoring=SCORING_CSV, per_stratum=DEFAULT_PER_STRATUM,
+                    seed=DEFAULT_SEED, chunksize=100_000):
+    """One pass over the evaluations; recordings contribute only recordingid -> outcome
+
+    recording / scoring: validated DataFrames, or CSV paths (the scoring CSV
+    is then streamed in chunks, unvalidated). Evaluations without a matching
+    recording are skipped, as in the merge in analysis.load_data
+    (validation.py reports them as orphan_evaluation).
+    """
+    if isinstance(recording, pd.DataFrame):
+        recording = recording[['recordingid', 'outcome']]
+    else:
+        recording = pd.read_csv(recording, usecols=['recordingid', 'outcome'])
+    outcomes = recording.drop_duplicates('recordingid').set_index('recordingid')['outcome']
+    if isinstance(scoring, pd.DataFrame):
+        chunks = _chunks(scoring, chunksize)
+    else:
+        chunks = pd.read_csv(scoring, chunksize=chunksize)
+    reservoir = StratifiedReservoir(per_stratum, seed)
+    with span('sample_reservoir') as s:
+        for chunk in chunks:
+            chunk['outcome'] = chunk['recordingid'].map(outcomes)
+            reservoir.update(chunk[chunk['outcome'].notna()])
+            s.add_rows(len(chunk))
+    return reservoir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and sample seeded stratified reservoirs of skill evaluations")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="stream the CSVs into a reservoir")
+    build.add_argument('--recording', default=RECORDING_CSV)
+    build.add_argument('--scoring', default=SCORING_CSV)
+    build.add_argument('--per-stratum', type=int, default=DEFAULT_PER_STRATUM)
+    build.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    build.add_argument('--chunksize', type=int, default=100_000)
+    build.add_argument('--output', default='reservoir.json')
+    build.add_argument('--no-validate', action='store_true',
+                       help="stream the raw scoring CSV in chunks instead of loading and validating both files")
+
+    sample = sub.add_parser('sample', help="print a round-robin sample from a saved reservoir")
+    sample.add_argument('reservoir')
+    sample.add_argument('-n', type=int, default=10)
+    sample.add_argument('--skill')
+    sample.add_argument('--band', choices=[name for name, _, _ in SCORE_BANDS] + ['unscored'])
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        recording, scoring = args.recording, args.scoring
+        if not args.no_validate:
+            recording, scoring, _, quality = validate(pd.read_csv(recording), pd.read_csv(scoring))
+            print(describe(quality))
+        reservoir = build_reservoir(recording, scoring, args.per_stratum, args.seed, args.chunksize)
+        reservoir.save(args.output)
+        print(f"Kept {len(reservoir.rows) if reservoir.rows is not None else 0} of {reservoir.seen} evaluations "
+              f"across {reservoir.stratum_count()} strata (seed {reservoir.seed})")
+        print(f"Reservoir saved to '{args.output}'")
+    else:
+        reservoir = StratifiedReservoir.load(args.reservoir)
+
+        def where(rows):
+            mask = pd.Series(True, index=rows.index)
+            if args.skill:
+                mask &= rows['skillName'] == args.skill
+            if args.band:
+                mask &= rows['score_band'] == args.band
+            return mask
+
+        picked = reservoir.sample(args.n, where)
+        print(picked[['recordingid', 'skillName', 'userId', 'outcome', 'score', 'week']].to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,499 @@
+"""
+Score and Call-Metric Distribution Sketches
+Constant-memory, mergeable summaries built in one streaming pass over the CSVs
+
+- ScoreHistogram: exact counts for small-integer skill scores (1-5)
+- KLLSketch: approximate quantiles for continuous metrics such as
+  duration_minutes and speaking_ratio (KLL sketch, O(k log n) memory)
+- DistributionSketches: histograms per skill, per rep and per day plus KLL
+  sketches per call metric, updated chunk by chunk during ingest
+
+Every sketch merges with another of the same kind, so per-day or per-worker
+sketches can be built independently and combined later, and they serialise
+to JSON. Charts and percentile tables are drawn from the sketches without
+keeping the raw rows.
+
+analysis.load_data folds the validated rows into a DistributionSketches at
+ingest and saves it as sketches.json next to the quality report; Slide 3's
+score statistics and chart 7 are read from it. Scores are counted only if
+they pass validation's score checks (validation.valid_scores).
+
+Usage:
+    python sketches.py build --output sketches.json [--chunksize 100000]
+    python sketches.py merge part1.json part2.json --output sketches.json
+    python sketches.py report sketches.json [--chart chart_07_score_distribution.png]
+"""
+
+import argparse
+import json
+import math
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from profiling import span
+from validation import valid_scores
+
+RECORDING_CSV = 'ds_takehome_recording.csv'
+SCORING_CSV = 'ds_takehome_scoring_metadata.csv'
+
+SKETCHES_FILE = 'sketches.json'
+
+CONTINUOUS_METRICS = ['duration_minutes', 'speaking_ratio']
+# Worst rank error measured at k=400 was ~0.35% (k=200 gave ~0.7%)
+DEFAULT_K = 400
+PERCENTILES = [0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+
+# ============================================================================
+# EXACT HISTOGRAM FOR INTEGER SCORES
+# ============================================================================
+class ScoreHistogram:
+    """Exact value counts for integer scores; non-integer values are rejected by callers"""
+
+    def __init__(self, counts=None):
+        self.counts = Counter(counts or {})
+
+    def update(self, values):
+        """Add an array of integer scores (NaNs must already be dropped)"""
+        values, counts = np.unique(np.asarray(values, dtype=np.int64), return_counts=True)
+        for value, count in zip(values.tolist(), counts.tolist()):
+            self.counts[value] += count
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+        return self
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def frequency(self, value):
+        return self.counts.get(value, 0)
+
+    def mean(self):
+        total = self.total
+        return sum(v * c for v, c in self.counts.items()) / total if total else float('nan')
+
+    def std(self):
+        """Sample standard deviation (ddof=1), matching pandas"""
+        total = self.total
+        if total < 2:
+            return float('nan')
+        mean = self.mean()
+        return math.sqrt(sum(c * (v - mean) ** 2 for v, c in self.counts.items()) / (total - 1))
+
+    def min(self):
+        return min(self.counts) if self.counts else float('nan')
+
+    def max(self):
+        return max(self.counts) if self.counts else float('nan')
+
+    def quantile(self, q):
+        """Exact lower quantile of the counted scores"""
+        target = q * self.total
+        cumulative = 0
+        for value in sorted(self.counts):
+            cumulative += self.counts[value]
+            if cumulative >= target:
+                return value
+        return float('nan')
+
+    def values_and_counts(self):
+        values = sorted(self.counts)
+        return values, [self.counts[v] for v in values]
+
+    def to_dict(self):
+        return {str(v): c for v, c in sorted(self.counts.items())}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls({int(v): c for v, c in data.items()})
+
+
+# ============================================================================
+# KLL QUANTILE SKETCH FOR CONTINUOUS METRICS
+# ============================================================================
+class KLLSketch:
+    """KLL streaming quantile sketch (Karnin, Lang & Liberty, 2016)
+
+    Level h holds items standing for 2**h original values. When a level
+    fills it is sorted and every other item (random offset) is promoted to
+    the next level, so memory stays O(k log(n/k)). Rank error is roughly
+    1.5/k in practice: up to ~0.35% at the default k=400.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.rng = np.random.default_rng(seed)
+
+    def _capacity(self, h):
+        depth = len(self.levels) - h - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _max_size(self):
+        return sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _size(self):
+        return sum(len(level) for level in self.levels)
+
+    def update(self, values):
+        """Add an array of values; NaNs are skipped"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        # Feed in k-sized slices so a huge chunk never sits uncompacted
+        step = self.k
+        for start in range(0, len(values), step):
+            self.levels[0] = np.concatenate([self.levels[0], values[start:start + step]])
+            self._compress()
+
+    def _compress(self):
+        while self._size() >= self._max_size():
+            for h, level in enumerate(self.levels):
+                if len(level) >= self._capacity(h):
+                    if h + 1 == len(self.levels):
+                        self.levels.append(np.empty(0))
+                    level = np.sort(level)
+                    # Keep one item back when the level has odd length
+                    keep = level[-1:] if len(level) % 2 else level[:0]
+                    even = level[:len(level) - len(keep)]
+                    promoted = even[int(self.rng.random() < 0.5)::2]
+                    self.levels[h] = keep
+                    self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                    break
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        """Approximate q-quantile (exact min/max at q=0 and q=1)"""
+        if self.n == 0:
+            return float('nan')
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        items, cumulative = self._weighted_items()
+        index = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return float(items[min(index, len(items) - 1)])
+
+    def quantiles(self, qs):
+        return [self.quantile(q) for q in qs]
+
+    def cdf(self, x):
+        """Approximate fraction of values <= x"""
+        if self.n == 0:
+            return float('nan')
+        items, cumulative = self._weighted_items()
+        index = np.searchsorted(items, x, side='right')
+        return float(cumulative[index - 1] / cumulative[-1]) if index else 0.0
+
+    def to_dict(self):
+        return {
+            'k': self.k,
+            'n': self.n,
+            'min': self.min if self.n else None,
+            'max': self.max if self.n else None,
+            'levels': [level.tolist() for level in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(k=data['k'])
+        sketch.n = data['n']
+        sketch.min = data['min'] if data['min'] is not None else math.inf
+        sketch.max = data['max'] if data['max'] is not None else -math.inf
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in data['levels']]
+        return sketch
+
+
+# ============================================================================
+# SKETCHES MAINTAINED DURING INGEST
+# ============================================================================
+def _grouped_histograms(store, keys, scores, label=None):
+    """Update one ScoreHistogram per key from parallel key/score arrays
+
+    label, if given, turns each group key into the stored key (applied once
+    per group, not per row).
+    """
+    frame = pd.DataFrame({'key': keys, 'score': scores})
+    counts = frame.groupby(['key', 'score']).size()
+    for (key, score), count in counts.items():
+        key = label(key) if label else key
+        store.setdefault(key, ScoreHistogram()).counts[int(score)] += int(count)
+
+
+def calendar_days(dates):
+    """Calendar day (datetime64[D]) of each timestamp, in the timestamps' own time zone
+
+    The convention the slides use (pandas .dt.date); sampling buckets days with it too.
+    """
+    dates = pd.to_datetime(dates)
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.to_numpy(dtype='datetime64[D]')
+
+
+def _day_label(day):
+    return day.strftime('%Y-%m-%d')
+
+
+class DistributionSketches:
+    """Score histograms per skill/rep/day plus KLL sketches per call metric"""
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.seed = seed
+        self.overall = ScoreHistogram()
+        self.by_skill = {}
+        self.by_user = {}
+        self.by_day = {}
+        self.metrics = {metric: KLLSketch(k, seed) for metric in CONTINUOUS_METRICS}
+        self.invalid_scores = 0
+        # Evaluations per skill without a countable score, so per-skill totals match the row counts
+        self.unscored_by_skill = Counter()
+
+    def update_scores(self, scoring_chunk):
+        """Fold a chunk of scoring rows (skillName, userId, recordingdate, score) into the histograms
+
+        Missing scores and scores failing validation's checks (non-numeric,
+        out of range, not whole) are skipped and counted in invalid_scores.
+        """
+        valid = valid_scores(scoring_chunk['score'])
+        self.invalid_scores += int((~valid).sum())
+        self.unscored_by_skill.update(scoring_chunk['skillName'][~valid].dropna().value_counts().to_dict())
+        chunk = scoring_chunk[valid]
+        scores = pd.to_numeric(chunk['score']).astype(np.int64).to_numpy()
+
+        self.overall.update(scores)
+        _grouped_histograms(self.by_skill, chunk['skillName'].to_numpy(), scores)
+        _grouped_histograms(self.by_user, chunk['userId'].to_numpy(), scores)
+        _grouped_histograms(self.by_day, calendar_days(chunk['recordingdate']), scores, label=_day_label)
+
+    def update_recordings(self, recording_chunk):
+        """Fold a chunk of recording rows into the continuous metric sketches"""
+        duration_minutes = recording_chunk['durationInMilliseconds'] / 60000
+        conversation_time = recording_chunk['conversationTime'].where(recording_chunk['conversationTime'] > 0)
+        speaking_ratio = recording_chunk['repSpeakingTime'] / conversation_time
+        self.metrics['duration_minutes'].update(duration_minutes.to_numpy(dtype=np.float64))
+        self.metrics['speaking_ratio'].update(speaking_ratio.to_numpy(dtype=np.float64))
+
+    def merge(self, other):
+        """Combine sketches from another partition or worker into this one"""
+        self.overall.merge(other.overall)
+        for mine, theirs in ((self.by_skill, other.by_skill), (self.by_user, other.by_user),
+                             (self.by_day, other.by_day)):
+            for key, histogram in theirs.items():
+                mine.setdefault(key, ScoreHistogram()).merge(histogram)
+        for metric, sketch in other.metrics.items():
+            self.metrics.setdefault(metric, KLLSketch(self.k, self.seed)).merge(sketch)
+        self.invalid_scores += other.invalid_scores
+        self.unscored_by_skill.update(other.unscored_by_skill)
+        return self
+
+    def scores_between(self, start=None, end=None):
+        """Score histogram over an inclusive YYYY-MM-DD day range, from the per-day histograms"""
+        combined = ScoreHistogram()
+        for day, histogram in self.by_day.items():
+            if (start is None or day >= start) and (end is None or day <= end):
+                combined.merge(histogram)
+        return combined
+
+    def to_dict(self):
+        return {
+            'k': self.k,
+            'overall': self.overall.to_dict(),
+            'by_skill': {key: h.to_dict() for key, h in sorted(self.by_skill.items())},
+            'by_user': {key: h.to_dict() for key, h in sorted(self.by_user.items())},
+            'by_day': {key: h.to_dict() for key, h in sorted(self.by_day.items())},
+            'metrics': {metric: sketch.to_dict() for metric, sketch in self.metrics.items()},
+            'invalid_scores': self.invalid_scores,
+            'unscored_by_skill': dict(sorted(self.unscored_by_skill.items())),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketches = cls(k=data['k'])
+        sketches.overall = ScoreHistogram.from_dict(data['overall'])
+        sketches.by_skill = {key: ScoreHistogram.from_dict(h) for key, h in data['by_skill'].items()}
+        sketches.by_user = {key: ScoreHistogram.from_dict(h) for key, h in data['by_user'].items()}
+        sketches.by_day = {key: ScoreHistogram.from_dict(h) for key, h in data['by_day'].items()}
+        sketches.metrics = {metric: KLLSketch.from_dict(s) for metric, s in data['metrics'].items()}
+        sketches.invalid_scores = data.get('invalid_scores', 0)
+        sketches.unscored_by_skill = Counter(data.get('unscored_by_skill', {}))
+        return sketches
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def build_sketches(recording_path=RECORDING_CSV, scoring_path=SCORING_CSV, chunksize=100_000, k=DEFAULT_K, seed=None):
+    """One streaming pass over both CSVs; only one chunk is held in memory at a time"""
+    sketches = DistributionSketches(k=k, seed=seed)
+    with span('sketch_scores') as s:
+        for chunk in pd.read_csv(scoring_path, chunksize=chunksize,
+                                 usecols=['skillName', 'userId', 'recordingdate', 'score']):
+            sketches.update_scores(chunk)
+            s.add_rows(len(chunk))
+    with span('sketch_recordings') as s:
+        for chunk in pd.read_csv(recording_path, chunksize=chunksize,
+                                 usecols=['durationInMilliseconds', 'conversationTime', 'repSpeakingTime']):
+            sketches.update_recordings(chunk)
+            s.add_rows(len(chunk))
+    return sketches
+
+
+# ============================================================================
+# CHARTS AND TABLES FROM SKETCHES
+# ============================================================================
+def plot_score_distribution(histogram, ax):
+    """Chart 7 (distribution of all skill scores) drawn from a ScoreHistogram"""
+    values, counts = histogram.values_and_counts()
+    # Weighted hist over the distinct values reproduces Series.hist(bins=20) on the raw scores
+    ax.hist(values, bins=20, weights=counts, color='#3498db', edgecolor='black', alpha=0.7)
+    ax.grid(True)
+    ax.set_title('Distribution of All Skill Scores', fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel('Score', fontsize=12)
+    ax.set_ylabel('Frequency', fontsize=12)
+    mean_score = histogram.mean()
+    ax.axvline(mean_score, color='red', linestyle='--', linewidth=2, label=f'Mean: {mean_score:.2f}')
+    ax.legend(fontsize=10)
+
+
+def percentile_table(sketches, percentiles=PERCENTILES):
+    """Percentiles of each continuous metric as a DataFrame"""
+    rows = {}
+    for metric, sketch in sketches.metrics.items():
+        rows[metric] = [sketch.n] + [sketch.quantile(q) for q in percentiles]
+    columns = ['count'] + [f"p{int(q * 100)}" for q in percentiles]
+    return pd.DataFrame.from_dict(rows, orient='index', columns=columns)
+
+
+def skill_score_stats(sketches):
+    """Per-skill mean, std, count, min and max, as scoring_df.groupby('skillName')['score'].agg would give
+
+    count is the number of scored evaluations; skills whose evaluations all
+    lack a valid score still get a row (count 0, NaN statistics).
+    """
+    skills = sorted(set(sketches.by_skill) | set(sketches.unscored_by_skill))
+    rows = {}
+    for skill in skills:
+        histogram = sketches.by_skill.get(skill, ScoreHistogram())
+        rows[skill] = {'mean': histogram.mean(), 'std': histogram.std(), 'count': histogram.total,
+                       'min': histogram.min(), 'max': histogram.max()}
+    table = pd.DataFrame.from_dict(rows, orient='index', columns=['mean', 'std', 'count', 'min', 'max'])
+    table.index.name = 'skillName'
+    # Validated scores are an integer column only when none is missing
+    table[['min', 'max']] = table[['min', 'max']].astype('float64' if sketches.invalid_scores else 'int64')
+    return table
+
+
+def skill_distribution_table(sketches):
+    """Per-skill mean, std and score frequencies, sorted by mean like Slide 3"""
+    rows = {}
+    for skill, histogram in sketches.by_skill.items():
+        row = {'mean': histogram.mean(), 'std': histogram.std(), 'count': histogram.total}
+        for score in range(1, 6):
+            row[f'score_{score}'] = histogram.frequency(score)
+        rows[skill] = row
+    table = pd.DataFrame.from_dict(rows, orient='index')
+    return table.sort_values('mean', ascending=False) if len(table) else table
+
+
+def print_report(sketches):
+    print("=" * 80)
+    print("SCORE AND CALL-METRIC DISTRIBUTIONS (FROM SKETCHES)")
+    print("=" * 80)
+    print(f"\nScored evaluations: {sketches.overall.total} ({sketches.invalid_scores} missing/invalid skipped)")
+    print(f"Average Skill Score: {sketches.overall.mean():.2f}/5.0")
+
+    print("\nSkill Score Distribution:")
+    print(skill_distribution_table(sketches).round(2).to_string())
+
+    discover_why = sketches.by_skill.get('Discover the "Why"')
+    if discover_why is not None and discover_why.total:
+        total = discover_why.total
+        print(f"\n'Discover the Why' Score Frequencies:")
+        print(f"  Score 1 Frequency: {discover_why.frequency(1)} ({discover_why.frequency(1) / total * 100:.1f}%)")
+        print(f"  Score 5 Frequency: {discover_why.frequency(5)} ({discover_why.frequency(5) / total * 100:.1f}%)")
+
+    print("\nCall Metric Percentiles:")
+    print(percentile_table(sketches).round(3))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build, merge and report mergeable distribution sketches")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="stream the CSVs into sketches")
+    build.add_argument('--recording', default=RECORDING_CSV)
+    build.add_argument('--scoring', default=SCORING_CSV)
+    build.add_argument('--chunksize', type=int, default=100_000)
+    build.add_argument('--k', type=int, default=DEFAULT_K, help="KLL accuracy parameter (rank error ~1.5/k)")
+    build.add_argument('--output', default='sketches.json')
+
+    merge = sub.add_parser('merge', help="combine sketches from several partitions or workers")
+    merge.add_argument('inputs', nargs='+')
+    merge.add_argument('--output', default='sketches.json')
+
+    report = sub.add_parser('report', help="print distribution and percentile tables")
+    report.add_argument('sketches')
+    report.add_argument('--chart', help="also save the score distribution chart to this path")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        sketches = build_sketches(args.recording, args.scoring, args.chunksize, args.k)
+        sketches.save(args.output)
+        print(f"Sketches saved to '{args.output}'")
+        print_report(sketches)
+    elif args.command == 'merge':
+        sketches = DistributionSketches.load(args.inputs[0])
+        for path in args.inputs[1:]:
+            sketches.merge(DistributionSketches.load(path))
+        sketches.save(args.output)
+        print(f"Merged {len(args.inputs)} sketch files into '{args.output}'")
+    else:
+        sketches = DistributionSketches.load(args.sketches)
+        print_report(sketches)
+        if args.chart:
+            import matplotlib.pyplot as plt
+            fig, ax = plt.subplots(figsize=(10, 6))
+            plot_score_distribution(sketches.overall, ax)
+            plt.tight_layout()
+            plt.savefig(args.chart, dpi=300, bbox_inches='tight')
+            plt.close(fig)
+            print(f"\nScore distribution chart saved to '{args.chart}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# The modules live at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SKILLS = ['Make a Friend', 'Discover the "Why"', 'Negotiation']
+
+
+@pytest.fixture
+def synthetic_frames():
+    """Synthetic recording and scoring frames over Aug 6 - Sep 28 2025 (both Slide 6 periods)"""
+    n_recordings = 60
+    rng = np.random.default_rng(0)
+    conversation = rng.integers(60_000, 3_600_000, n_recordings)
+    recordings = pd.DataFrame({
+        'recordingid': [f'rec{i}' for i in range(n_recordings)],
+        'userId': rng.choice([f'user_{i}' for i in range(4)], n_recordings),
+        'dateCreated': (pd.Timestamp('2025-08-06') + pd.to_timedelta(rng.integers(0, 53 * 24 * 60, n_recordings),
+                                                                    unit='min')).strftime('%Y-%m-%dT%H:%M:%S'),
+        'durationInMilliseconds': conversation + 5000,
+        'conversationTime': conversation,
+        'repSpeakingTime': (conversation * rng.random(n_recordings)).astype(int),
+        'repQuestionsCount': rng.integers(0, 30, n_recordings),
+        'customerQuestionsCount': rng.integers(0, 20, n_recordings),
+        'repWordCount': rng.integers(100, 5000, n_recordings),
+        'outcome': rng.choice(['won', 'lost'], n_recordings),
+    })
+    scores = recordings[['recordingid', 'userId', 'dateCreated']].merge(pd.Series(SKILLS, name='skillName'),
+                                                                        how='cross')
+    scores = scores.rename(columns={'dateCreated': 'recordingdate'})
+    scores['score'] = rng.integers(1, 6, len(scores)).astype(object)
+    scores['scoringMetadata'] = [json.dumps({'impact': 'i', 'recommendation': 'r'})] * len(scores)
+    return recordings, scores
@@ -0,0 +1,95 @@
+import random
+
+import pandas as pd
+
+from drift import DETECTOR_PARAMS, DriftMonitor, PageHinkley, daily_aggregates
+
+USERS = [f'user_{i}' for i in range(5)]
+SKILLS = ['Make a Friend', 'Discover the "Why"', 'Negotiation']
+
+
+def _days(n):
+    return [f'2025-{8 + d // 28:02d}-{1 + d % 28:02d}' for d in range(n)]
+
+
+def _feed(monitor, rng, days, win_probability, mean_score, calls_per_day=3):
+    alerts = []
+    for i, day in enumerate(days):
+        rep_outcomes, skill_scores = {}, {}
+        for _ in range(calls_per_day):
+            user = rng.choice(USERS)
+            won = rng.random() < win_probability(i)
+            wins, n = rep_outcomes.get(user, (0, 0))
+            rep_outcomes[user] = (wins + won, n + 1)
+            for skill in SKILLS:
+                score = min(5, max(1, round(rng.gauss(mean_score, 1))))
+                total, count = skill_scores.get(skill, (0.0, 0))
+                skill_scores[skill] = (total + score, count + 1)
+        alerts += monitor.update_day(day, rep_outcomes, skill_scores)
+    return alerts
+
+
+def test_no_alarms_on_stationary_series():
+    for seed in range(10):
+        rng = random.Random(seed)
+        detector = PageHinkley(**DETECTOR_PARAMS)
+        alarms = [detector.update(day, rng.gauss(50, 20)) for day in _days(84)]
+        assert not any(alarms), f"seed {seed}"
+
+        monitor = DriftMonitor()
+        assert _feed(monitor, rng, _days(84), lambda i: 0.5, 3.2) == [], f"seed {seed}"
+
+
+def test_detects_step_down_in_win_rate():
+    monitor = DriftMonitor()
+    alerts = _feed(monitor, random.Random(0), _days(84), lambda i: 0.65 if i < 42 else 0.25, 3.2,
+                   calls_per_day=20)
+    win_rate = [a for a in alerts if a['series'] == 'win_rate']
+    assert win_rate and win_rate[0]['direction'] == 'decrease'
+    assert win_rate[0]['change_date'] >= _days(84)[35]
+
+
+def test_snapshots_are_shared_per_day():
+    monitor = DriftMonitor()
+    _feed(monitor, random.Random(1), _days(40), lambda i: 0.5, 3.2)
+    pointed_at = {day for days in monitor.snapshots.values() for day in days.values()}
+    assert set(monitor.day_snapshots) == pointed_at
+    assert len(monitor.day_snapshots) <= len(monitor.snapshots) * 2
+
+    restored = DriftMonitor.from_dict(monitor.to_dict())
+    assert restored.day_snapshots == monitor.day_snapshots
+
+
+def test_attribution_ignores_tiny_reps_and_ranks_by_significance():
+    monitor = DriftMonitor()
+    monitor.snapshots['win_rate'] = {'decrease': '2025-08-10'}
+    monitor.day_snapshots['2025-08-10'] = {
+        'reps': {'tiny': [1, 1], 'big_drop': [30, 50], 'small_drop': [6, 10]},
+        'skills': {},
+    }
+    monitor.totals = {
+        'reps': {'tiny': [1, 2], 'big_drop': [40, 100], 'small_drop': [8, 15]},
+        'skills': {},
+    }
+    alert = monitor._build_alert('win_rate', 'decrease', '2025-08-10', '2025-08-20')
+    names = [r['name'] for r in alert['reps']]
+    assert 'tiny' not in names
+    assert names[0] == 'big_drop'
+
+
+def test_daily_aggregates_cover_every_row_once():
+    recording_df = pd.DataFrame({
+        'dateCreated': pd.to_datetime(['2025-08-06 09:00', '2025-08-06 17:00', '2025-08-08 10:00']),
+        'userId': ['a', 'b', 'a'],
+        'outcome': ['won', 'lost', 'lost'],
+    })
+    merged_df = pd.DataFrame({
+        'dateCreated': pd.to_datetime(['2025-08-06 09:00', '2025-08-06 17:00', '2025-08-07 12:00']),
+        'skillName': ['Negotiation', 'Negotiation', 'Make a Friend'],
+        'score': [4, 2, 3],
+    })
+    assert list(daily_aggregates(recording_df, merged_df)) == [
+        ('2025-08-06', {'a': (1, 1), 'b': (0, 1)}, {'Negotiation': (6.0, 2)}),
+        ('2025-08-07', {}, {'Make a Friend': (3.0, 1)}),
+        ('2025-08-08', {'a': (0, 1)}, {}),
+    ]
@@ -0,0 +1,40 @@
+import contextlib
+import io
+
+import pytest
+
+from analysis import open_engine
+from check_engine_parity import CHECKS, compare
+
+pytest.importorskip('duckdb')
+
+
+def _save(directory, recordings, scores):
+    recording_path, scoring_path = directory / 'r.csv', directory / 's.csv'
+    recordings.to_csv(recording_path, index=False)
+    scores.to_csv(scoring_path, index=False)
+    return str(recording_path), str(scoring_path)
+
+
+def _assert_parity(recording_path, scoring_path, validate):
+    with contextlib.redirect_stdout(io.StringIO()):
+        engines = [open_engine(name, recording_path, scoring_path, validate=validate) for name in ('pandas', 'duckdb')]
+    for check in CHECKS:
+        compare(*(getattr(engine, check)() for engine in engines))
+
+
+@pytest.mark.parametrize('validate', [True, False])
+def test_clean_data(tmp_path, synthetic_frames, validate):
+    _assert_parity(*_save(tmp_path, *synthetic_frames), validate)
+
+
+@pytest.mark.parametrize('validate', [True, False])
+def test_dirty_scores(tmp_path, synthetic_frames, validate):
+    recordings, scores = synthetic_frames
+    # Out of range, fractional, unparseable and missing scores, plus an orphan evaluation
+    scores.loc[[0, 5, 9], 'score'] = 7
+    scores.loc[[1, 13], 'score'] = 3.5
+    scores.loc[2, 'score'] = 'n/a'
+    scores.loc[3, 'score'] = None
+    scores.loc[4, 'recordingid'] = 'ghost'
+    _assert_parity(*_save(tmp_path, recordings, scores), validate)
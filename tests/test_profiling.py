@@ -0,0 +1,24 @@
+import atexit
+
+import profiling
+
+
+def test_restart_suffixes_the_base_prefix(monkeypatch, tmp_path):
+    registered = []
+    monkeypatch.setattr(atexit, 'register', registered.append)
+    monkeypatch.setattr(profiling, '_profiler', None)
+    monkeypatch.setattr(profiling, '_base_prefix', None)
+    monkeypatch.setattr(profiling, '_atexit_registered', False)
+
+    base = str(tmp_path / 'prof')
+    profiling.enable(base, stage_mode='cprofile')
+    profilers = [profiling.restart(tenant) for tenant in ['a', 'b', 'bad tenant']]
+
+    assert [p.prefix for p in profilers] == [f'{base}_a', f'{base}_b', f'{base}_bad_tenant']
+    assert {p.stage_mode for p in profilers} == {'cprofile'}
+    assert len(registered) == 1
+
+
+def test_restart_when_disabled(monkeypatch):
+    monkeypatch.setattr(profiling, '_profiler', None)
+    assert profiling.restart('a') is None
@@ -0,0 +1,121 @@
+import contextlib
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from analysis import load_data
+from engines import PandasEngine
+from rep_service import RepRollups, make_handler
+
+
+@pytest.fixture
+def loaded(tmp_path, synthetic_frames):
+    recordings, scores = synthetic_frames
+    recordings.to_csv(tmp_path / 'r.csv', index=False)
+    scores.to_csv(tmp_path / 's.csv', index=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return load_data(str(tmp_path / 'r.csv'), str(tmp_path / 's.csv'))
+
+
+@pytest.fixture
+def rollups(loaded):
+    recording_df, _, merged_df = loaded
+    return RepRollups.build(recording_df, merged_df)
+
+
+def _slide5(loaded, start, end):
+    """Slide 5 table from the pandas engine over recordings made in [start, end]"""
+    recording_df, scoring_df, merged_df = loaded
+    in_range = lambda dates: (dates.dt.date >= pd.Timestamp(start).date()) & (dates.dt.date <= pd.Timestamp(end).date())
+    engine = PandasEngine(recording_df[in_range(recording_df['dateCreated'])], scoring_df,
+                          merged_df[in_range(merged_df['dateCreated'])])
+    return engine.user_stats()
+
+
+@pytest.mark.parametrize('start, end', [
+    ('2025-08-06', '2025-09-28'),
+    ('2025-08-10', '2025-08-31'),
+    ('2025-09-01', '2025-09-14'),
+    ('2025-08-20', '2025-08-20'),
+])
+def test_rep_table_matches_pandas(loaded, rollups, start, end):
+    expected = _slide5(loaded, start, end)
+    rows = {row['userId']: row for row in rollups.rep_table(start, end)}
+    assert sorted(rows) == sorted(expected.index)
+    for user_id, stats in expected.iterrows():
+        for column, value in stats.items():
+            # Both sides round to 2 places; sums in a different order can land either side of a half
+            assert rows[user_id][column] == pytest.approx(value, abs=0.011), (user_id, column)
+
+
+def test_date_bounds_are_inclusive(loaded, rollups):
+    recording_df = loaded[0]
+    day = recording_df['dateCreated'].dt.date.value_counts().idxmax()
+    on_day = (recording_df['dateCreated'].dt.date == day).sum()
+
+    single_day = sum(row['num_recordings'] for row in rollups.rep_table(str(day), str(day)))
+    assert single_day == on_day
+    before = sum(row['num_recordings'] for row in rollups.rep_table(None, str(day)))
+    after = sum(row['num_recordings'] for row in rollups.rep_table(str(day + pd.Timedelta(days=1)), None))
+    assert before + after == len(recording_df)
+
+
+def test_empty_ranges(rollups):
+    assert rollups.rep_table('2025-09-01', '2025-08-01') == []
+    assert rollups.rep_table('2024-01-01', '2024-12-31') == []
+    user_id = rollups.users[0]
+    assert rollups.rep_detail(user_id, '2030-01-01', '2030-01-31') == {
+        'userId': user_id, 'num_recordings': 0, 'skills': {}}
+
+
+def test_unknown_rep(rollups):
+    assert rollups.rep_detail('nobody') is None
+
+
+def test_rep_detail_skills(loaded, rollups):
+    merged_df = loaded[2]
+    user_id = rollups.users[0]
+    detail = rollups.rep_detail(user_id)
+    expected = merged_df[merged_df['userId_recording'] == user_id].groupby('skillName')['score'].agg(['mean', 'count'])
+    assert {skill: s['evaluations'] for skill, s in detail['skills'].items()} == expected['count'].to_dict()
+    for skill, s in detail['skills'].items():
+        assert s['avg_score'] == pytest.approx(expected.loc[skill, 'mean'], abs=0.006)
+
+
+@pytest.fixture
+def server(rollups):
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(rollups))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_http_routes(server, rollups):
+    status, body = _get(f'{server}/reps?start=2025-08-06&end=2025-09-28')
+    assert status == 200 and body['reps'] == rollups.rep_table('2025-08-06', '2025-09-28')
+    assert _get(f'{server}/health')[0] == 200
+    assert _get(f'{server}/reps/nobody')[0] == 404
+    assert _get(f'{server}/nowhere')[0] == 404
+
+
+@pytest.mark.parametrize('query', ['start=yesterday', 'end=2025-13-45', 'start=2025-08-06&end=soon'])
+def test_http_bad_query_params(server, query):
+    status, body = _get(f'{server}/reps?{query}')
+    assert status == 400 and 'error' in body
+    assert _get(f'{server}/reps/user_0?{query}')[0] == 400
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from sampling import StratifiedReservoir, priorities, week_start
+from sketches import calendar_days
+
+SKILLS = ['Make a Friend', 'Discover the "Why"', 'Value Proposition', 'Demonstration', 'Overcome Objections',
+          'Negotiation', 'Secure the Sale']
+
+
+def _evaluations(n_recordings, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'recordingid': np.repeat([f'rec{i}' for i in range(n_recordings)], len(SKILLS)),
+        'skillName': SKILLS * n_recordings,
+    })
+    frame['userId'] = rng.choice([f'user_{i}' for i in range(5)], len(frame))
+    frame['outcome'] = rng.choice(['won', 'lost'], len(frame))
+    frame['score'] = rng.integers(1, 6, len(frame))
+    frame['recordingdate'] = '2025-08-06T10:00:00'
+    return frame
+
+
+def test_skill_priorities_uncorrelated_within_recording():
+    frame = _evaluations(5000)
+    for seed in (0, 1, 42):
+        ranks = pd.Series(priorities(frame, seed)).rank().to_numpy().reshape(-1, len(SKILLS))
+        corr = np.corrcoef(ranks, rowvar=False)
+        off_diagonal = corr[~np.eye(len(SKILLS), dtype=bool)]
+        # Independent ranks over 5000 recordings: |r| is well under 0.05
+        assert np.abs(off_diagonal).max() < 0.05, f"seed {seed}: {off_diagonal.round(2)}"
+
+
+def test_reservoir_independent_of_row_order_and_chunking():
+    frame = _evaluations(300)
+    whole = StratifiedReservoir(per_stratum=3)
+    whole.update(frame)
+
+    chunked = StratifiedReservoir(per_stratum=3)
+    shuffled = frame.sample(frac=1, random_state=7)
+    for start in range(0, len(shuffled), 250):
+        part = StratifiedReservoir(per_stratum=3)
+        part.update(shuffled.iloc[start:start + 250])
+        chunked.merge(part)
+
+    key = ['recordingid', 'skillName']
+    assert (whole.rows.sort_values(key)[key].to_numpy() == chunked.rows.sort_values(key)[key].to_numpy()).all()
+    assert whole.seen == chunked.seen == len(frame)
+
+
+def test_days_follow_the_sketches_convention():
+    # 01:00 on Monday Aug 11 at +02:00 is still Sunday in UTC; both modules use the local calendar day
+    dates = pd.Series(pd.to_datetime(['2025-08-11T01:00:00+02:00', '2025-08-10T12:00:00+02:00']))
+    assert list(week_start(dates).astype(str)) == ['2025-08-11', '2025-08-04']
+    assert list(calendar_days(dates).astype(str)) == ['2025-08-11', '2025-08-10']
+
+    reservoir = StratifiedReservoir()
+    reservoir.update(_evaluations(2).assign(recordingdate='2025-08-11T01:00:00+02:00'))
+    assert set(reservoir.rows['day']) == {'2025-08-11'}
+    assert set(reservoir.rows['week']) == {'2025-08-11'}
@@ -0,0 +1,21 @@
+from analysis import RECORDING_CSV, SCORING_CSV
+from check_startup import REPO_DIR, run_importtime
+
+# The stats-only path must not load the chart stack, the LLM client or the optional engine
+HEAVY_MODULES = {'matplotlib', 'seaborn', 'openai', 'duckdb'}
+
+
+def test_import_analysis_stays_light():
+    _, packages = run_importtime(['-c', 'import analysis'], cwd=REPO_DIR)
+    assert 'pandas' in packages
+    assert not packages & HEAVY_MODULES
+
+
+def test_no_charts_run_stays_light(tmp_path, synthetic_frames):
+    recordings, scores = synthetic_frames
+    recordings.to_csv(tmp_path / RECORDING_CSV, index=False)
+    scores.to_csv(tmp_path / SCORING_CSV, index=False)
+
+    _, packages = run_importtime([f'{REPO_DIR}/analysis.py', '--no-charts', '--output-dir', str(tmp_path)],
+                                 cwd=tmp_path)
+    assert not packages & HEAVY_MODULES
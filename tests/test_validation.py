@@ -0,0 +1,106 @@
+import pandas as pd
+import pytest
+
+from validation import FLAG_ONLY, validate
+
+SKILLS = ['Make a Friend', 'Discover the "Why"']
+
+
+def _frames(n=4, tz=''):
+    """Clean recording and scoring frames (object columns, as a CSV with a bad value would load)"""
+    recordings = pd.DataFrame({
+        'recordingid': [f'rec{i}' for i in range(n)],
+        'userId': [f'user_{i % 2}' for i in range(n)],
+        'dateCreated': [f'2025-08-{6 + i:02d}T10:00:00{tz}' for i in range(n)],
+        'durationInMilliseconds': [600_000] * n,
+        'conversationTime': [500_000] * n,
+        'repSpeakingTime': [200_000] * n,
+        'repQuestionsCount': [5] * n,
+        'customerQuestionsCount': [3] * n,
+        'repWordCount': [900] * n,
+        'outcome': ['won', 'lost'] * (n // 2),
+    }, dtype=object)
+    scores = pd.DataFrame([
+        {'recordingid': rec, 'userId': user, 'recordingdate': date, 'skillName': skill, 'score': 3,
+         'scoringMetadata': '{"impact": "i", "recommendation": "r"}'}
+        for rec, user, date in recordings[['recordingid', 'userId', 'dateCreated']].itertuples(index=False)
+        for skill in SKILLS
+    ], dtype=object)
+    return recordings, scores
+
+
+def _set(frame, row, column, value):
+    frame.loc[row, column] = value
+    return frame
+
+
+def _append_copy(frame, row):
+    return pd.concat([frame, frame.iloc[[row]]], ignore_index=True)
+
+
+# reason -> (source, mutation of (recordings, scores) returning the new pair)
+CASES = {
+    'missing:outcome': ('recording', lambda r, s: (_set(r, 0, 'outcome', None), s)),
+    'non_numeric:repWordCount': ('recording', lambda r, s: (_set(r, 0, 'repWordCount', 'many'), s)),
+    'negative:repQuestionsCount': ('recording', lambda r, s: (_set(r, 0, 'repQuestionsCount', -1), s)),
+    'bad_timestamp:dateCreated': ('recording', lambda r, s: (_set(r, 1, 'dateCreated', 'garbage'), s)),
+    'timestamp_out_of_range:recordingdate': ('scoring',
+                                             lambda r, s: (r, _set(s, 0, 'recordingdate', '1990-01-01'))),
+    'zero_conversation_time': ('recording', lambda r, s: (_set(_set(r, 0, 'conversationTime', 0),
+                                                               0, 'repSpeakingTime', 0), s)),
+    'speaking_exceeds_conversation': ('recording', lambda r, s: (_set(r, 0, 'repSpeakingTime', 550_000), s)),
+    'duplicate_recordingid': ('recording', lambda r, s: (_append_copy(r, 0), s)),
+    'duplicate_evaluation': ('scoring', lambda r, s: (r, _append_copy(s, 0))),
+    'score_out_of_range': ('scoring', lambda r, s: (r, _set(s, 0, 'score', 7))),
+    'non_integer:score': ('scoring', lambda r, s: (r, _set(s, 0, 'score', 3.5))),
+    'orphan_evaluation': ('scoring', lambda r, s: (r, _set(s, 0, 'recordingid', 'ghost'))),
+    'parent_quarantined': ('scoring', lambda r, s: (_set(r, 0, 'outcome', None), s)),
+    'missing:score': ('scoring', lambda r, s: (r, _set(s, 0, 'score', None))),
+    'bad_metadata': ('scoring', lambda r, s: (r, _set(s, 0, 'scoringMetadata', 'not json'))),
+    'no_evaluations': ('recording', lambda r, s: (r, s[s['recordingid'] != 'rec0'].reset_index(drop=True))),
+    'conversation_exceeds_duration': ('recording', lambda r, s: (_set(r, 0, 'conversationTime', 700_000), s)),
+    'user_mismatch': ('scoring', lambda r, s: (r, _set(s, 0, 'userId', 'user_9'))),
+    'date_mismatch': ('scoring', lambda r, s: (r, _set(s, 0, 'recordingdate', '2025-08-20T10:00:00'))),
+}
+
+
+def _reasons(quarantine_df, source):
+    rows = quarantine_df[quarantine_df['source'] == source]
+    return rows.assign(reason=rows['reasons'].str.split(';')).explode('reason')
+
+
+def test_clean_frames_pass():
+    recordings, scores, quarantine_df, metrics = validate(*_frames())
+    assert quarantine_df.empty
+    assert (len(recordings), len(scores)) == (4, 8)
+    assert scores['score'].dtype == 'int64'
+
+
+@pytest.mark.parametrize('reason', sorted(CASES))
+def test_reason_code(reason):
+    source, mutate = CASES[reason]
+    raw = dict(zip(['recording', 'scoring'], mutate(*_frames())))
+    kept_recordings, kept_scores, quarantine_df, _ = validate(raw['recording'], raw['scoring'])
+    kept = {'recording': kept_recordings, 'scoring': kept_scores}
+
+    rows = _reasons(quarantine_df, source)
+    hit = rows[rows['reason'] == reason]
+    assert len(hit) >= 1, quarantine_df[['source', 'row', 'reasons']].to_string()
+    if reason in FLAG_ONLY:
+        assert (hit['action'] == 'flagged').all()
+        assert len(kept[source]) == len(raw[source])
+    else:
+        assert (hit['action'] == 'quarantined').all()
+        assert len(kept[source]) == len(raw[source]) - hit['row'].nunique()
+
+
+@pytest.mark.parametrize('tz', ['Z', '+02:00', ''])
+def test_one_bad_timestamp_is_quarantined(tz):
+    recordings, scores = _frames(tz=tz)
+    recordings.loc[1, 'dateCreated'] = 'garbage'
+    scores.loc[2, 'recordingdate'] = 'not a date'
+    kept_recordings, kept_scores, _, metrics = validate(recordings, scores)
+    assert metrics['recordings']['reasons'] == {'bad_timestamp:dateCreated': 1}
+    assert metrics['evaluations']['reasons'] == {'bad_timestamp:recordingdate': 1, 'parent_quarantined': 2}
+    assert len(kept_recordings) == 3
+    assert (kept_recordings['dateCreated'].dt.tz is None) == (tz == '')
@@ -0,0 +1,320 @@
+"""
+Data Validation and Quarantine
+Vectorized checks on the raw recording and scoring frames, run during ingest
+
+analysis.load_data used to coerce bad data silently: unparseable scores
+became NaN, zero conversationTime gave an infinite speaking ratio, and the
+inner merge dropped evaluations whose recording was missing. validate() now
+checks schema, ranges, duplicates, timestamps and recordingid referential
+integrity with whole-column operations, and reports every problem row with
+reason codes.
+
+Reason codes either quarantine the row (it is removed before analysis) or
+only flag it (it is kept, as before, but reported):
+    missing:<col>, non_numeric:<col>, negative:<col>     quarantine
+    bad_timestamp:<col>, timestamp_out_of_range:<col>    quarantine
+    zero_conversation_time, speaking_exceeds_conversation quarantine
+    duplicate_recordingid, duplicate_evaluation          quarantine
+    score_out_of_range, non_integer:score                quarantine
+    orphan_evaluation                                    quarantine
+    parent_quarantined                                   quarantine
+    missing:score, bad_metadata, no_evaluations          flag
+    conversation_exceeds_duration                        flag
+    user_mismatch, date_mismatch                         flag
+
+write_report() writes quarantine.csv (one row per problem row, with the raw
+record as JSON) and data_quality.json (per-run counts and null rates).
+
+Usage:
+    python validation.py                          # report on the default CSVs
+    python validation.py --output-dir quality/
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from profiling import span
+
+RECORDING_CSV = 'ds_takehome_recording.csv'
+SCORING_CSV = 'ds_takehome_scoring_metadata.csv'
+
+RECORDING_COLUMNS = [
+    'recordingid', 'userId', 'dateCreated', 'durationInMilliseconds', 'conversationTime',
+    'repSpeakingTime', 'repQuestionsCount', 'customerQuestionsCount', 'repWordCount', 'outcome',
+]
+RECORDING_NUMERIC = [
+    'durationInMilliseconds', 'conversationTime', 'repSpeakingTime',
+    'repQuestionsCount', 'customerQuestionsCount', 'repWordCount',
+]
+SCORING_COLUMNS = ['recordingid', 'userId', 'recordingdate', 'skillName', 'score', 'scoringMetadata']
+# Scoring columns a row cannot be used without (a missing score is only flagged)
+SCORING_REQUIRED = ['recordingid', 'skillName', 'recordingdate']
+
+SCORE_RANGE = (1, 5)
+EARLIEST_TIMESTAMP = pd.Timestamp('2000-01-01')
+FUTURE_TOLERANCE = pd.Timedelta(days=1)
+
+FLAG_ONLY = {
+    'missing:score', 'bad_metadata', 'no_evaluations',
+    'conversation_exceeds_duration', 'user_mismatch', 'date_mismatch',
+}
+
+QUARANTINE_FILE = 'quarantine.csv'
+METRICS_FILE = 'data_quality.json'
+
+
+class _Issues:
+    """Collects (row position, reason) pairs for one source frame"""
+
+    def __init__(self, source, raw_df):
+        self.source = source
+        self.n_rows = len(raw_df)
+        # Null masks are reused by several checks; isna on string columns is not free
+        self.nulls = {c: raw_df[c].isna().to_numpy() for c in raw_df.columns}
+        self.rows = []
+        self.reasons = []
+        self.counts = {}
+
+    def add(self, reason, mask):
+        positions = np.flatnonzero(np.asarray(mask, dtype=bool))
+        if len(positions):
+            self.rows.append(positions)
+            self.reasons.append(np.full(len(positions), reason, dtype=object))
+            self.counts[reason] = self.counts.get(reason, 0) + len(positions)
+
+    def quarantine_mask(self):
+        """Rows with at least one reason that is not flag-only"""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        for positions, reasons in zip(self.rows, self.reasons):
+            if reasons[0] not in FLAG_ONLY:
+                mask[positions] = True
+        return mask
+
+    def table(self, raw_df, drop):
+        """One row per problem row: source, row, recordingid, action, reasons, record"""
+        if not self.rows:
+            return pd.DataFrame(columns=['source', 'row', 'recordingid', 'action', 'reasons', 'record'])
+        pairs = pd.DataFrame({'row': np.concatenate(self.rows), 'reason': np.concatenate(self.reasons)})
+        reasons = pairs.groupby('row', sort=True)['reason'].agg(';'.join)
+        positions = reasons.index.to_numpy()
+        raw = raw_df.iloc[positions]
+        return pd.DataFrame({
+            'source': self.source,
+            'row': positions,
+            'recordingid': raw['recordingid'].to_numpy(),
+            'action': np.where(drop[positions], 'quarantined', 'flagged'),
+            'reasons': reasons.to_numpy(),
+            'record': raw.to_json(orient='records', lines=True, date_format='iso').splitlines(),
+        })
+
+    def summary(self, drop):
+        flagged = np.zeros(self.n_rows, dtype=bool)
+        if self.rows:
+            flagged[np.concatenate(self.rows)] = True
+        return {
+            'rows': self.n_rows,
+            'quarantined': int(drop.sum()),
+            'flagged_only': int((flagged & ~drop).sum()),
+            'reasons': dict(sorted(self.counts.items())),
+            'null_rate': {c: round(float(nulls.mean()), 6) if self.n_rows else 0.0 for c, nulls in self.nulls.items()},
+        }
+
+
+def _require_columns(df, columns, source):
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f"{source} data is missing columns: {', '.join(missing)}")
+
+
+def _check_timestamp(df, column, issues, now):
+    """Parse a timestamp column, recording unparseable and implausible values"""
+    present = ~issues.nulls[column]
+    parsed = pd.to_datetime(df[column], errors='coerce')
+    # The format is inferred from the first value; retry the few misses one by one
+    retry = parsed.isna().to_numpy() & present
+    if retry.any():
+        # Parsed as UTC and brought back to the column's tz (or naive), so the values can be assigned into it
+        retried = pd.to_datetime(df.loc[retry, column], errors='coerce', format='mixed', utc=True)
+        tz = parsed.dt.tz
+        parsed[retry] = retried.dt.tz_convert(tz) if tz is not None else retried.dt.tz_localize(None)
+    is_nat = parsed.isna().to_numpy()
+    issues.add(f'bad_timestamp:{column}', present & is_nat)
+    # Compare on naive values so tz-aware inputs are checked the same way
+    naive = parsed.dt.tz_localize(None) if parsed.dt.tz is not None else parsed
+    out_of_range = (naive < EARLIEST_TIMESTAMP) | (naive > now + FUTURE_TOLERANCE)
+    issues.add(f'timestamp_out_of_range:{column}', out_of_range.to_numpy() & ~is_nat)
+    return parsed
+
+
+def _check_numeric(df, column, issues):
+    values = pd.to_numeric(df[column], errors='coerce')
+    issues.add(f'non_numeric:{column}', ~issues.nulls[column] & values.isna().to_numpy())
+    return values
+
+
+def _check_recordings(recording_df, issues, now):
+    checked = recording_df.copy()
+    for column in RECORDING_COLUMNS:
+        issues.add(f'missing:{column}', issues.nulls[column])
+
+    for column in RECORDING_NUMERIC:
+        checked[column] = _check_numeric(checked, column, issues)
+        issues.add(f'negative:{column}', (checked[column] < 0).to_numpy())
+
+    checked['dateCreated'] = _check_timestamp(checked, 'dateCreated', issues, now)
+
+    conversation = checked['conversationTime']
+    issues.add('zero_conversation_time', (conversation == 0).to_numpy())
+    issues.add('speaking_exceeds_conversation', (checked['repSpeakingTime'] > conversation).to_numpy())
+    issues.add('conversation_exceeds_duration', (conversation > checked['durationInMilliseconds']).to_numpy())
+
+    issues.add('duplicate_recordingid', ~issues.nulls['recordingid'] & checked['recordingid'].duplicated().to_numpy())
+    return checked
+
+
+def _check_scores(scoring_df, issues, now):
+    checked = scoring_df.copy()
+    for column in SCORING_REQUIRED:
+        issues.add(f'missing:{column}', issues.nulls[column])
+
+    issues.add('missing:score', issues.nulls['score'])
+    checked['score'] = _check_numeric(checked, 'score', issues)
+    low, high = SCORE_RANGE
+    issues.add('score_out_of_range', ((checked['score'] < low) | (checked['score'] > high)).to_numpy())
+    # Grades are whole numbers; the sketches' exact histograms rely on it
+    issues.add('non_integer:score', (checked['score'] != checked['score'].round()).to_numpy()
+               & checked['score'].notna().to_numpy())
+
+    checked['recordingdate'] = _check_timestamp(checked, 'recordingdate', issues, now)
+
+    # Structural check only: json.loads on every row would dominate the run time
+    present = ~issues.nulls['scoringMetadata']
+    metadata = checked['scoringMetadata'].astype(str).to_numpy(dtype=object)[present]
+    well_formed = np.zeros(len(checked), dtype=bool)
+    well_formed[present] = [m[:1] == '{' and m[-1:] == '}' for m in metadata]
+    issues.add('bad_metadata', ~well_formed)
+
+    keys_present = ~(issues.nulls['recordingid'] | issues.nulls['skillName'])
+    issues.add('duplicate_evaluation', keys_present & checked.duplicated(['recordingid', 'skillName']).to_numpy())
+    return checked
+
+
+def valid_scores(scores):
+    """Mask of scores that pass the score checks: numeric, whole and within SCORE_RANGE"""
+    scores = pd.to_numeric(scores, errors='coerce')
+    low, high = SCORE_RANGE
+    return ((scores >= low) & (scores <= high) & (scores == scores.round())).to_numpy()
+
+
+def _check_references(recordings, recording_issues, scores, scoring_issues, recording_drop):
+    """recordingid integrity between the two frames, after row-level checks
+
+    Evaluations are matched to the first row of each recordingid with a
+    single hash lookup; the parent's position then gives its quarantine
+    status, userId and timestamp by array indexing.
+    """
+    first = ~recordings['recordingid'].duplicated().to_numpy() & ~recording_issues.nulls['recordingid']
+    parents = recordings[first]
+    parent_pos = pd.Index(parents['recordingid']).get_indexer(scores['recordingid'])
+    known = parent_pos >= 0
+    scoring_issues.add('orphan_evaluation', ~scoring_issues.nulls['recordingid'] & ~known)
+    if not len(parents):
+        return
+    parent_pos = np.where(known, parent_pos, 0)
+
+    scoring_issues.add('parent_quarantined', known & recording_drop[first][parent_pos])
+    evaluated = np.bincount(parent_pos[known], minlength=len(parents)) > 0
+    no_evaluations = np.zeros(len(recordings), dtype=bool)
+    no_evaluations[np.flatnonzero(first)[~evaluated]] = True
+    recording_issues.add('no_evaluations', no_evaluations)
+
+    parent_user = parents['userId'].to_numpy(dtype=object)[parent_pos]
+    user_known = known & ~scoring_issues.nulls['userId'] & ~recording_issues.nulls['userId'][first][parent_pos]
+    scoring_issues.add('user_mismatch', user_known & (parent_user != scores['userId'].to_numpy(dtype=object)))
+    # datetime64 arrays (UTC for tz-aware columns); plain to_numpy() would box every value as a Timestamp
+    parent_date = parents['dateCreated'].to_numpy(dtype='datetime64[ns]')[parent_pos]
+    score_date = scores['recordingdate'].to_numpy(dtype='datetime64[ns]')
+    date_known = known & ~pd.isna(parent_date) & ~pd.isna(score_date)
+    scoring_issues.add('date_mismatch', date_known & (parent_date != score_date))
+
+
+def validate(recording_df, scoring_df):
+    """Check raw recording and scoring frames
+
+    Returns (recording_df, scoring_df, quarantine_df, metrics). The returned
+    frames have quarantined rows removed, numeric columns and scores coerced
+    and timestamps parsed; quarantine_df lists every quarantined or flagged row.
+    """
+    start = time.perf_counter()
+    with span('validate') as s:
+        _require_columns(recording_df, RECORDING_COLUMNS, 'Recording')
+        _require_columns(scoring_df, SCORING_COLUMNS, 'Scoring')
+        now = pd.Timestamp.now()
+
+        recording_issues = _Issues('recording', recording_df)
+        scoring_issues = _Issues('scoring', scoring_df)
+        recordings = _check_recordings(recording_df, recording_issues, now)
+        scores = _check_scores(scoring_df, scoring_issues, now)
+        recording_drop = recording_issues.quarantine_mask()
+        _check_references(recordings, recording_issues, scores, scoring_issues, recording_drop)
+        scoring_drop = scoring_issues.quarantine_mask()
+
+        quarantine_df = pd.concat([
+            recording_issues.table(recording_df, recording_drop),
+            scoring_issues.table(scoring_df, scoring_drop),
+        ], ignore_index=True)
+        metrics = {
+            'validated_at': now.isoformat(timespec='seconds'),
+            'recordings': recording_issues.summary(recording_drop),
+            'evaluations': scoring_issues.summary(scoring_drop),
+            'elapsed_s': round(time.perf_counter() - start, 3),
+        }
+        s.add_rows(len(recording_df) + len(scoring_df))
+
+    scores = scores[~scoring_drop].reset_index(drop=True)
+    # Whole numbers once bad rows are gone: keep the integer dtype pd.to_numeric gives a clean column
+    if scores['score'].notna().all():
+        scores['score'] = scores['score'].astype('int64')
+    return recordings[~recording_drop].reset_index(drop=True), scores, quarantine_df, metrics
+
+
+def describe(metrics):
+    """One-line summary for the ingest log"""
+    rec, ev = metrics['recordings'], metrics['evaluations']
+    return (f"Validation: quarantined {rec['quarantined']} recordings and {ev['quarantined']} evaluations, "
+            f"flagged {rec['flagged_only'] + ev['flagged_only']} more rows")
+
+
+def write_report(quarantine_df, metrics, output_dir='.'):
+    """Write quarantine.csv and data_quality.json; returns their paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    quarantine_path = os.path.join(output_dir, QUARANTINE_FILE)
+    metrics_path = os.path.join(output_dir, METRICS_FILE)
+    quarantine_df.to_csv(quarantine_path, index=False)
+    with open(metrics_path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+    return quarantine_path, metrics_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate the recording and scoring CSVs")
+    parser.add_argument('--recording', default=RECORDING_CSV)
+    parser.add_argument('--scoring', default=SCORING_CSV)
+    parser.add_argument('--output-dir', default='.', help="where quarantine.csv and data_quality.json go")
+    args = parser.parse_args(argv)
+
+    _, _, quarantine_df, metrics = validate(pd.read_csv(args.recording), pd.read_csv(args.scoring))
+    print(describe(metrics))
+    for source in ('recordings', 'evaluations'):
+        for reason, count in metrics[source]['reasons'].items():
+            print(f"  {source:<12} {reason:<45} {count}")
+    quarantine_path, metrics_path = write_report(quarantine_df, metrics, args.output_dir)
+    print(f"Quarantine saved to '{quarantine_path}', metrics to '{metrics_path}'")
+
+
+if __name__ == '__main__':
+    main()